@@ -6,13 +6,29 @@ from dataclasses import dataclass
 import logging
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import Platform
+from homeassistant.const import CONF_SCAN_INTERVAL, Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.storage import Store
+from homeassistant.helpers.typing import ConfigType
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .coordinator import CACoordinator
+from .const import (
+    DOMAIN,
+    ENERGY_STORAGE_KEY,
+    FILTER_STORAGE_KEY,
+    LEGACY_CYCLE_SLEEP,
+    LEGACY_SCAN_INTERVAL,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    conf_group_interval,
+)
+from .coordinator import REQUEST_GROUPS, CACoordinator
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -24,6 +40,8 @@ PLATFORMS: list[Platform] = [
     Platform.CLIMATE,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 type MyConfigEntry = ConfigEntry[RuntimeData]
 
 
@@ -35,6 +53,14 @@ class RuntimeData:
     coordinator: DataUpdateCoordinator
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Comfoair integration."""
+    # Services are registered once, not per config entry, so they exist
+    # and can report a proper error while the entry is not loaded.
+    async_setup_services(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, config_entry: MyConfigEntry) -> bool:
     """Set up Example Integration from a config entry."""
 
@@ -68,10 +94,44 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: MyConfigEntry) ->
     # This calls the async_setup method in each of your entity type files.
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
 
+    # For a known unit the first poll was skipped to speed up startup, run it now
+    # without blocking setup.
+    if coordinator.first_poll_deferred:
+        config_entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{coordinator.name} first poll"
+        )
+
     # Return true to denote a successful setup.
     return True
 
 
+async def async_migrate_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
+    """Migrate the options of an older config entry."""
+    if config_entry.version > 1:
+        # Downgraded from a future version.
+        return False
+
+    if config_entry.minor_version < 2:
+        options = dict(config_entry.options)
+        if (scan_interval := options.pop(CONF_SCAN_INTERVAL, None)) is not None:
+            # Scale the group defaults by the cycle time of the old poll
+            # cycle, so the bus carries no more commands than it did.
+            factor = (scan_interval + LEGACY_CYCLE_SLEEP) / (
+                LEGACY_SCAN_INTERVAL + LEGACY_CYCLE_SLEEP
+            )
+            for group in REQUEST_GROUPS:
+                options[conf_group_interval(group.key)] = min(
+                    max(round(group.interval * factor), MIN_SCAN_INTERVAL),
+                    MAX_SCAN_INTERVAL,
+                )
+        hass.config_entries.async_update_entry(
+            config_entry, options=options, minor_version=2
+        )
+        _LOGGER.debug("Migrated options to %s", options)
+
+    return True
+
+
 async def _async_update_listener(hass: HomeAssistant, config_entry):
     """Handle config options update."""
     # Reload the integration when the options change.
@@ -91,7 +151,13 @@ async def async_remove_config_entry_device(
 async def async_unload_entry(hass: HomeAssistant, config_entry: MyConfigEntry) -> bool:
     """Unload a config entry."""
     # This is called when you remove your integration or shutdown HA.
-    # If you have created any custom services, they need to be removed here too.
-
     # Unload platforms and return result
     return await hass.config_entries.async_unload_platforms(config_entry, PLATFORMS)
+
+
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Remove the data stored for a deleted config entry."""
+    for key in (STORAGE_KEY, ENERGY_STORAGE_KEY, FILTER_STORAGE_KEY):
+        await Store(
+            hass, STORAGE_VERSION, f"{key}.{config_entry.entry_id}"
+        ).async_remove()
@@ -41,7 +41,7 @@ class CABinarySensor(CoordinatorEntity, BinarySensorEntity):
 
     def __init__(self, coordinator: CACoordinator, device: Device) -> None:
         """Initialise sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device.key)
         self.device = device
         self.device_id = device.device_id
 
@@ -55,6 +55,13 @@ class CABinarySensor(CoordinatorEntity, BinarySensorEntity):
         _LOGGER.debug("Device: %s", self.device)
         self.async_write_ha_state()
 
+    @property
+    def available(self) -> bool:
+        """Return if the device is available."""
+        # Stale while its request group is not answering or once its value
+        # is older than the max age.
+        return super().available and self.coordinator.device_available(self.device)
+
     @property
     def device_class(self) -> str:
         """Return device class."""
@@ -0,0 +1,124 @@
+"""Fixed size buffers for recent data of the unit."""
+
+from array import array
+import typing
+
+T = typing.TypeVar("T")
+
+
+class RingBuffer(typing.Generic[T]):
+    """Keeps the last items appended, in a list allocated once.
+
+    Appending overwrites the oldest item once the buffer is full, so memory
+    stays bounded however long the integration runs.
+    """
+
+    __slots__ = ("_count", "_items", "_next")
+
+    def __init__(self, size: int) -> None:
+        """Initialise buffer."""
+        self._items: list[T | None] = [None] * size
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of items held."""
+        return self._count
+
+    def __iter__(self) -> typing.Iterator[T]:
+        """Iterate from the oldest to the newest item."""
+        size = len(self._items)
+        start = self._next - self._count
+        for position in range(start, self._next):
+            yield typing.cast(T, self._items[position % size])
+
+    def append(self, item: T) -> None:
+        """Add an item, dropping the oldest one if the buffer is full."""
+        self._items[self._next] = item
+        self._next = (self._next + 1) % len(self._items)
+        self._count = min(self._count + 1, len(self._items))
+
+
+class SampleBuffer:
+    """Keeps the last timestamped samples of a number in two float arrays.
+
+    Takes 16 bytes per sample, allocated once, instead of a tuple and two
+    float objects per sample in a list.
+    """
+
+    __slots__ = ("_count", "_next", "_times", "_values")
+
+    def __init__(self, size: int) -> None:
+        """Initialise buffer."""
+        self._times = array("d", bytes(8 * size))
+        self._values = array("d", bytes(8 * size))
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self._count
+
+    def __iter__(self) -> typing.Iterator[tuple[float, float]]:
+        """Iterate over timestamp and value from the oldest sample."""
+        size = len(self._times)
+        for position in range(self._next - self._count, self._next):
+            yield self._times[position % size], self._values[position % size]
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a sample, dropping the oldest one if the buffer is full."""
+        self._times[self._next] = timestamp
+        self._values[self._next] = value
+        self._next = (self._next + 1) % len(self._times)
+        self._count = min(self._count + 1, len(self._times))
+
+    def clear(self) -> None:
+        """Drop all samples."""
+        self._count = 0
+
+    def first(self) -> tuple[float, float] | None:
+        """Return the oldest sample."""
+        if not self._count:
+            return None
+        position = (self._next - self._count) % len(self._times)
+        return self._times[position], self._values[position]
+
+    def last(self) -> tuple[float, float] | None:
+        """Return the newest sample."""
+        if not self._count:
+            return None
+        return self._times[self._next - 1], self._values[self._next - 1]
+
+    def windows(
+        self, start: float, width: float
+    ) -> list[tuple[float, float, float, float, int]]:
+        """Return start, min, max, mean and count of the samples per window.
+
+        The windows are width seconds long and begin at start, windows
+        without samples are left out.
+        """
+        result: list[tuple[float, float, float, float, int]] = []
+        current = -1
+        low = high = total = 0.0
+        count = 0
+
+        for timestamp, value in self:
+            if timestamp < start:
+                continue
+            if (index := int((timestamp - start) // width)) != current:
+                if count:
+                    result.append(
+                        (start + current * width, low, high, total / count, count)
+                    )
+                current = index
+                low = high = total = value
+                count = 1
+                continue
+            low = min(low, value)
+            high = max(high, value)
+            total += value
+            count += 1
+
+        if count:
+            result.append((start + current * width, low, high, total / count, count))
+        return result
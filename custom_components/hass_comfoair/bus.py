@@ -0,0 +1,222 @@
+"""Command scheduler for the serial bus of a ComfoAir unit."""
+
+import asyncio
+import collections
+from dataclasses import dataclass, field
+import enum
+import itertools
+import logging
+import time
+import typing
+
+import comfoair
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+_LOGGER = logging.getLogger(__name__)
+
+# Consecutive unanswered commands after which the connection counts as stalled.
+STALL_TIMEOUTS = 3
+
+# Pause between reconnects of a stalled connection, doubled on every attempt.
+RECONNECT_BACKOFF = 5.0
+MAX_RECONNECT_BACKOFF = 300.0
+
+# Deadline for dropping and reopening the connection.
+RECONNECT_TIMEOUT = 30.0
+
+# Number of recent round trips kept for the latency statistics.
+LATENCY_SAMPLES = 200
+
+
+class Priority(enum.IntEnum):
+    """Priority classes of bus commands, lower values are sent first."""
+
+    WRITE = 0
+    READBACK = 1
+    POLL = 2
+    DIAGNOSTIC = 3
+
+
+@dataclass(slots=True)
+class Command:
+    """A queued command and the caller waiting for it."""
+
+    send: typing.Callable[[], typing.Awaitable[None]]
+    response: comfoair.CAReponse | None
+    future: asyncio.Future[None] = field(repr=False)
+
+
+class CABus:
+    """Sends commands to the unit one at a time, most urgent first.
+
+    A command with a response is complete once the last attribute of the
+    response frame has been decoded, see attribute_received. Commands of the
+    same priority are sent in the order they were queued.
+
+    A gateway can stop answering without closing the socket. After
+    STALL_TIMEOUTS unanswered commands in a row the connection is reopened,
+    with a growing pause between attempts. Commands queued during that pause
+    fail right away instead of each waiting for its timeout.
+    """
+
+    def __init__(
+        self,
+        guard_time: float,
+        command_timeout: float,
+        reconnect: typing.Callable[[], typing.Awaitable[None]],
+    ) -> None:
+        """Initialise bus."""
+        # Pause between two frames and deadline for sending a command and
+        # receiving its response.
+        self.guard_time = guard_time
+        self.command_timeout = command_timeout
+        self._reconnect = reconnect
+
+        # Counters of connection trouble since start.
+        self.timeouts = 0
+        self.reconnects = 0
+        self._consecutive_timeouts = 0
+        # Seconds from sending a command to receiving its response, of all
+        # commands and per response command.
+        self.latencies: collections.deque[float] = collections.deque(
+            maxlen=LATENCY_SAMPLES
+        )
+        self.command_latencies: collections.defaultdict[
+            int, collections.deque[float]
+        ] = collections.defaultdict(lambda: collections.deque(maxlen=LATENCY_SAMPLES))
+        self._backoff = RECONNECT_BACKOFF
+        self._reconnect_after = 0.0
+
+        self._queue: asyncio.PriorityQueue[tuple[int, int, Command]] = (
+            asyncio.PriorityQueue()
+        )
+        self._sequence = itertools.count()
+        self._response_event = asyncio.Event()
+        self._awaited_response: comfoair.CAReponse | None = None
+        self._worker: asyncio.Task | None = None
+
+    def start(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+        """Start sending queued commands."""
+        if self._worker is None:
+            self._worker = config_entry.async_create_background_task(
+                hass, self._async_worker(), f"{config_entry.title} bus"
+            )
+
+    async def async_stop(self) -> None:
+        """Stop the worker and fail all queued commands."""
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+
+        while not self._queue.empty():
+            _, _, command = self._queue.get_nowait()
+            if not command.future.done():
+                command.future.cancel()
+
+    async def async_send(
+        self,
+        priority: Priority,
+        send: typing.Callable[[], typing.Awaitable[None]],
+        response: comfoair.CAReponse | None = None,
+    ) -> None:
+        """Queue a command and wait until it has been answered.
+
+        Raises TimeoutError if the response did not arrive in time.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait(
+            (priority, next(self._sequence), Command(send, response, future))
+        )
+        await future
+
+    def latency(self, quantile: float, response_cmd: int | None = None) -> float | None:
+        """Return a quantile of the recent round trip times in seconds.
+
+        Across all commands, or of the commands answered by response_cmd.
+        """
+        latencies = (
+            self.latencies
+            if response_cmd is None
+            else self.command_latencies.get(response_cmd)
+        )
+        if not latencies:
+            return None
+        samples = sorted(latencies)
+        return samples[min(int(quantile * len(samples)), len(samples) - 1)]
+
+    @property
+    def stalled(self) -> bool:
+        """Return if the unit stopped answering."""
+        return self._consecutive_timeouts >= STALL_TIMEOUTS
+
+    def attribute_received(self, attribute: comfoair.CAReponse) -> None:
+        """Complete the running command once its response is decoded."""
+        # Any frame from the unit proves the connection is alive.
+        self._consecutive_timeouts = 0
+        self._backoff = RECONNECT_BACKOFF
+
+        if attribute == self._awaited_response:
+            self._response_event.set()
+
+    async def _async_worker(self) -> None:
+        """Send queued commands until cancelled."""
+        while True:
+            _, _, command = await self._queue.get()
+            if command.future.done():
+                # The caller is gone, do not waste bus time.
+                continue
+
+            try:
+                await self._async_execute(command)
+            except Exception as err:  # noqa: BLE001
+                if not command.future.done():
+                    command.future.set_exception(err)
+            else:
+                if not command.future.done():
+                    command.future.set_result(None)
+
+    async def _async_execute(self, command: Command) -> None:
+        """Send a command and wait for its response."""
+        if self.stalled:
+            if time.monotonic() < self._reconnect_after:
+                raise TimeoutError("Connection stalled, waiting to reconnect")
+            await self._async_reconnect()
+
+        self._response_event.clear()
+        self._awaited_response = command.response
+        try:
+            async with asyncio.timeout(self.command_timeout):
+                sent = time.monotonic()
+                await command.send()
+                if command.response is not None:
+                    await self._response_event.wait()
+                    latency = time.monotonic() - sent
+                    self.latencies.append(latency)
+                    self.command_latencies[command.response.cmd].append(latency)
+        except TimeoutError:
+            self.timeouts += 1
+            self._consecutive_timeouts += 1
+            raise
+        finally:
+            self._awaited_response = None
+
+            # Leave the bus idle for a moment before the next frame.
+            await asyncio.sleep(self.guard_time)
+
+    async def _async_reconnect(self) -> None:
+        """Reopen the connection and back off before the next attempt."""
+        self.reconnects += 1
+        _LOGGER.warning(
+            "No response to %d commands, reconnecting", self._consecutive_timeouts
+        )
+        self._reconnect_after = time.monotonic() + self._backoff
+        self._backoff = min(self._backoff * 2, MAX_RECONNECT_BACKOFF)
+
+        try:
+            async with asyncio.timeout(RECONNECT_TIMEOUT):
+                await self._reconnect()
+        except Exception as err:  # noqa: BLE001
+            _LOGGER.warning("Reconnect failed: %s", err)
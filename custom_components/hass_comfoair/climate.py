@@ -52,7 +52,7 @@ class CAClimateBypass(CoordinatorEntity, ClimateEntity):
 
     def __init__(self, coordinator: CACoordinator, device: Device) -> None:
         """Initialise sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device.key)
         self.device = device
         self.device_id = device.device_id
 
@@ -70,10 +70,27 @@ class CAClimateBypass(CoordinatorEntity, ClimateEntity):
             self.device.device_type, self.device_id
         )
         _LOGGER.debug("Device: %s", self.device)
-        self._attr_current_temperature = self.device.state
-        self._attr_target_temperature = self.device.state
         self.async_write_ha_state()
 
+    @property
+    def current_temperature(self) -> float | None:
+        """Return the comfort temperature."""
+        # Read from the device, the entity is only notified on changes and
+        # may be added after the first refresh.
+        return self.device.state
+
+    @property
+    def target_temperature(self) -> float | None:
+        """Return the comfort temperature."""
+        return self.device.state
+
+    @property
+    def available(self) -> bool:
+        """Return if the device is available."""
+        # Unavailable while the comfort temperature is not answered or is
+        # older than the max age.
+        return super().available and self.coordinator.device_available(self.device)
+
     @property
     def device_info(self) -> DeviceInfo:
         """Return device information."""
@@ -97,6 +114,3 @@ class CAClimateBypass(CoordinatorEntity, ClimateEntity):
         _LOGGER.debug("Setting comfort temperature to %s", new_temp)
 
         await self.coordinator.set_comfort_temperature(new_temp)
-
-        # trigger data refresh
-        await self.coordinator.async_request_refresh()
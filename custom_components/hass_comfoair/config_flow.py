@@ -10,11 +10,40 @@ import comfoair.async_api
 import voluptuous as vol
 
 from homeassistant.config_entries import ConfigFlow, ConfigFlowResult, OptionsFlow
-from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL
+from homeassistant.const import CONF_HOST, CONF_PORT
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN, MIN_SCAN_INTERVAL
+from .const import (
+    CONF_ADAPTIVE_MAX_FACTOR,
+    CONF_ADAPTIVE_POLLING,
+    CONF_COMMAND_TIMEOUT,
+    CONF_FILTER_LIFE,
+    CONF_GUARD_TIME,
+    CONF_MAX_AGE_POLLS,
+    CONF_NOMINAL_AIRFLOW,
+    DEFAULT_ADAPTIVE_MAX_FACTOR,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_COMMAND_TIMEOUT,
+    DEFAULT_FILTER_LIFE,
+    DEFAULT_GUARD_TIME,
+    DEFAULT_MAX_AGE_POLLS,
+    DEFAULT_NOMINAL_AIRFLOW,
+    DOMAIN,
+    MAX_ADAPTIVE_MAX_FACTOR,
+    MAX_FILTER_LIFE,
+    MAX_GUARD_TIME,
+    MAX_NOMINAL_AIRFLOW,
+    MAX_SCAN_INTERVAL,
+    MIN_ADAPTIVE_MAX_FACTOR,
+    MIN_COMMAND_TIMEOUT,
+    MIN_FILTER_LIFE,
+    MIN_MAX_AGE_POLLS,
+    MIN_NOMINAL_AIRFLOW,
+    MIN_SCAN_INTERVAL,
+    conf_group_interval,
+)
+from .coordinator import REQUEST_GROUPS
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -52,6 +81,8 @@ class CAConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Example Integration."""
 
     VERSION = 1
+    # 2: scan_interval replaced by one interval per request group.
+    MINOR_VERSION = 2
     _input_data: dict[str, Any]
 
     @staticmethod
@@ -147,14 +178,83 @@ class CAOptionsFlowHandler(OptionsFlow):
         # It is recommended to prepopulate options fields with default values if available.
         # These will be the same default values you use on your coordinator for setting variable values
         # if the option has not been set.
+        # One poll interval per request group.
+        intervals = {
+            vol.Required(
+                conf_group_interval(group.key),
+                default=self.config_entry.options.get(
+                    conf_group_interval(group.key), group.interval
+                ),
+            ): (
+                vol.All(
+                    vol.Coerce(int),
+                    vol.Clamp(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL),
+                )
+            )
+            for group in REQUEST_GROUPS
+        }
         data_schema = vol.Schema(
             {
+                **intervals,
+                vol.Required(
+                    CONF_ADAPTIVE_POLLING,
+                    default=self.config_entry.options.get(
+                        CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+                    ),
+                ): bool,
+                vol.Required(
+                    CONF_ADAPTIVE_MAX_FACTOR,
+                    default=self.config_entry.options.get(
+                        CONF_ADAPTIVE_MAX_FACTOR, DEFAULT_ADAPTIVE_MAX_FACTOR
+                    ),
+                ): (
+                    vol.All(
+                        vol.Coerce(int),
+                        vol.Clamp(
+                            min=MIN_ADAPTIVE_MAX_FACTOR, max=MAX_ADAPTIVE_MAX_FACTOR
+                        ),
+                    )
+                ),
+                vol.Required(
+                    CONF_GUARD_TIME,
+                    default=self.config_entry.options.get(
+                        CONF_GUARD_TIME, DEFAULT_GUARD_TIME
+                    ),
+                ): (vol.All(vol.Coerce(float), vol.Clamp(min=0, max=MAX_GUARD_TIME))),
+                vol.Required(
+                    CONF_COMMAND_TIMEOUT,
+                    default=self.config_entry.options.get(
+                        CONF_COMMAND_TIMEOUT, DEFAULT_COMMAND_TIMEOUT
+                    ),
+                ): (vol.All(vol.Coerce(float), vol.Clamp(min=MIN_COMMAND_TIMEOUT))),
+                vol.Required(
+                    CONF_MAX_AGE_POLLS,
+                    default=self.config_entry.options.get(
+                        CONF_MAX_AGE_POLLS, DEFAULT_MAX_AGE_POLLS
+                    ),
+                ): (vol.All(vol.Coerce(int), vol.Clamp(min=MIN_MAX_AGE_POLLS))),
+                vol.Required(
+                    CONF_NOMINAL_AIRFLOW,
+                    default=self.config_entry.options.get(
+                        CONF_NOMINAL_AIRFLOW, DEFAULT_NOMINAL_AIRFLOW
+                    ),
+                ): (
+                    vol.All(
+                        vol.Coerce(int),
+                        vol.Clamp(min=MIN_NOMINAL_AIRFLOW, max=MAX_NOMINAL_AIRFLOW),
+                    )
+                ),
                 vol.Required(
-                    CONF_SCAN_INTERVAL,
+                    CONF_FILTER_LIFE,
                     default=self.config_entry.options.get(
-                        CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+                        CONF_FILTER_LIFE, DEFAULT_FILTER_LIFE
                     ),
-                ): (vol.All(vol.Coerce(int), vol.Clamp(min=MIN_SCAN_INTERVAL))),
+                ): (
+                    vol.All(
+                        vol.Coerce(int),
+                        vol.Clamp(min=MIN_FILTER_LIFE, max=MAX_FILTER_LIFE),
+                    )
+                ),
             }
         )
 
@@ -2,5 +2,54 @@
 
 DOMAIN = "hass_comfoair"
 
-DEFAULT_SCAN_INTERVAL = 60
+STORAGE_KEY = f"{DOMAIN}.device_info"
+ENERGY_STORAGE_KEY = f"{DOMAIN}.energy"
+FILTER_STORAGE_KEY = f"{DOMAIN}.filter"
+STORAGE_VERSION = 1
+
 MIN_SCAN_INTERVAL = 10
+MAX_SCAN_INTERVAL = 86400
+
+# The former single poll cycle sent seven commands every scan interval and
+# slept 2 s after all but the last. Its scan_interval option is migrated to
+# one interval per request group, see async_migrate_entry.
+LEGACY_SCAN_INTERVAL = 60
+LEGACY_CYCLE_SLEEP = 12
+
+# Adaptive polling backs quiet groups off up to this multiple of their interval.
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+DEFAULT_ADAPTIVE_POLLING = False
+CONF_ADAPTIVE_MAX_FACTOR = "adaptive_max_factor"
+DEFAULT_ADAPTIVE_MAX_FACTOR = 6
+MIN_ADAPTIVE_MAX_FACTOR = 2
+MAX_ADAPTIVE_MAX_FACTOR = 20
+
+CONF_GUARD_TIME = "guard_time"
+DEFAULT_GUARD_TIME = 0.1
+MAX_GUARD_TIME = 2.0
+
+CONF_COMMAND_TIMEOUT = "command_timeout"
+DEFAULT_COMMAND_TIMEOUT = 5.0
+MIN_COMMAND_TIMEOUT = 1.0
+
+# Values older than this many poll intervals of their group are stale.
+CONF_MAX_AGE_POLLS = "max_age_polls"
+DEFAULT_MAX_AGE_POLLS = 3
+MIN_MAX_AGE_POLLS = 2
+
+# Airflow at 100 % ventilation in m³/h, 350 for a ComfoAir 350.
+CONF_NOMINAL_AIRFLOW = "nominal_airflow"
+DEFAULT_NOMINAL_AIRFLOW = 350
+MIN_NOMINAL_AIRFLOW = 50
+MAX_NOMINAL_AIRFLOW = 1000
+
+# Filter running hours until the filter is due, 16 weeks by default.
+CONF_FILTER_LIFE = "filter_life"
+DEFAULT_FILTER_LIFE = 2688
+MIN_FILTER_LIFE = 168
+MAX_FILTER_LIFE = 8760
+
+
+def conf_group_interval(group_key: str) -> str:
+    """Return the option key holding the poll interval of a request group."""
+    return f"interval_{group_key}"
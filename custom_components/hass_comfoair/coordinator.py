@@ -4,37 +4,469 @@ import asyncio
 from dataclasses import dataclass
 from datetime import timedelta
 import logging
+import math
+import time
 import typing
 
 import comfoair
 import comfoair.async_api
 import comfoair.model
 
-from homeassistant.components.sensor import SensorDeviceClass
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_HOST, CONF_PORT, CONF_SCAN_INTERVAL
-from homeassistant.core import DOMAIN, HomeAssistant
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.core import DOMAIN, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DEFAULT_SCAN_INTERVAL
+from .buffer import RingBuffer, SampleBuffer
+from .bus import CABus, Priority
+from .const import (
+    CONF_ADAPTIVE_MAX_FACTOR,
+    CONF_ADAPTIVE_POLLING,
+    CONF_COMMAND_TIMEOUT,
+    CONF_FILTER_LIFE,
+    CONF_GUARD_TIME,
+    CONF_MAX_AGE_POLLS,
+    CONF_NOMINAL_AIRFLOW,
+    DEFAULT_ADAPTIVE_MAX_FACTOR,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_COMMAND_TIMEOUT,
+    DEFAULT_FILTER_LIFE,
+    DEFAULT_GUARD_TIME,
+    DEFAULT_MAX_AGE_POLLS,
+    DEFAULT_NOMINAL_AIRFLOW,
+    ENERGY_STORAGE_KEY,
+    FILTER_STORAGE_KEY,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+    STORAGE_KEY,
+    STORAGE_VERSION,
+    conf_group_interval,
+)
+from .energy import EnergyIntegrator
+from .maintenance import FilterPredictor
 
 _LOGGER = logging.getLogger(__name__)
 
+# Groups falling due this close to an update tick are polled with it.
+SCHEDULE_SLACK = 1.0
 
-@dataclass
-class Device:
-    """API device."""
+# Adaptive polling aims at this many changed values per poll of a group. The
+# rate of change is smoothed over the last polls with this weight.
+ADAPTIVE_CHANGES_PER_POLL = 1.0
+ADAPTIVE_SMOOTHING = 0.3
+
+# Extra attempts for a request group that did not answer, within one update.
+GROUP_RETRIES = 2
+
+# Listener context of the entities showing bus statistics.
+DIAGNOSTICS_KEY = ("diagnostic", 0)
+
+# Recent decoded attributes and raw frames kept for the diagnostics.
+ATTRIBUTE_LOG_SIZE = 500
+FRAME_LOG_SIZE = 100
+
+# Unchanged attribute values are logged at most this often (seconds).
+LOG_SAMPLE_INTERVAL = 300.0
+
+# Samples kept per attribute for get_history, hours at the default intervals.
+HISTORY_SIZE = 2048
+
+# Delays for saving the energy counter and the filter wear, writes in
+# between are merged.
+ENERGY_SAVE_DELAY = 300
+FILTER_SAVE_DELAY = 60
+
+# Writes to the same target within this window are merged, the last one wins.
+WRITE_DEBOUNCE = 0.5
+
+
+class CAClient(comfoair.async_api.ComfoAir):
+    """ComfoAir client counting the frames its parser had to drop.
+
+    _parse_msg is private to comfoair and may change in any release, which is
+    why manifest.json pins the exact version this was written against. Check
+    the return value below when updating the requirement.
+    """
+
+    def __init__(self, url: str) -> None:
+        """Initialise client."""
+        super().__init__(url)
+        self.checksum_errors = 0
+
+    def _parse_msg(self, buf: bytes) -> list[int | str | bytes]:
+        res = super()._parse_msg(buf)
+        # Bytes consumed without a message: a frame failed its checksum or length.
+        if len(res) == 1 and res[0]:
+            self.checksum_errors += 1
+        return res
+
+
+def response_key(attribute: comfoair.CAReponse) -> tuple[int, int]:
+    """Return a hashable key identifying a response attribute.
+
+    The attributes handed to listeners carry a label which the module level
+    constants lack, and the label is part of their hash, so they cannot be
+    used as dictionary keys directly.
+    """
+    return attribute.cmd, attribute.offset
+
+
+class AttributeLogger:
+    """Logs decoded attributes without flooding the log.
+
+    A new value of an attribute is logged at info level, an unchanged one at
+    most every LOG_SAMPLE_INTERVAL seconds at debug level. Nothing is
+    formatted unless the level is enabled.
+    """
+
+    __slots__ = ("_last", "_logger")
+
+    def __init__(self, logger: logging.Logger) -> None:
+        """Initialise attribute logger."""
+        self._logger = logger
+        # Last logged value and time per response attribute.
+        self._last: dict[tuple[int, int], tuple[typing.Any, float]] = {}
+
+    def log(
+        self, key: tuple[int, int], attribute: comfoair.CAReponse, value: typing.Any
+    ) -> None:
+        """Log a decoded attribute if it changed or its sample is due."""
+        logger = self._logger
+        if not logger.isEnabledFor(logging.INFO):
+            return
+
+        now = time.monotonic()
+        last = self._last.get(key)
+        if last is None or last[0] != value:
+            self._last[key] = value, now
+            logger.info("Attribute %s: %s", attribute.label, value)
+        elif now - last[1] >= LOG_SAMPLE_INTERVAL and logger.isEnabledFor(
+            logging.DEBUG
+        ):
+            self._last[key] = value, now
+            logger.debug("Attribute %s unchanged: %s", attribute.label, value)
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceDescription:
+    """Static description of an API device."""
 
     device_id: int
-    device_unique_id: str
-    device_class: str | None
-    device_type: str
     name: str
-    state: typing.Any
-    ca_response: comfoair.CAReponse
+    device_type: str
+    # None for devices derived from other attributes.
+    ca_response: comfoair.CAReponse | None
+    device_class: str | None = None
     uom: str | None = None
     icon: str | None = None
+    state_class: str | None = SensorStateClass.MEASUREMENT
+    # Changes up to the larger of the absolute and the relative deadband are
+    # not published, unless the value was not published for max_silence seconds.
+    deadband: float = 0.0
+    deadband_rel: float = 0.0
+    max_silence: float | None = None
+    # Derived devices: computed by derive(coordinator, *values) from the values
+    # of the input attributes whenever one of them changes. Without derive the
+    # coordinator updates the device itself and the inputs only decide its
+    # availability.
+    inputs: tuple[comfoair.CAReponse, ...] = ()
+    derive: typing.Callable[..., float | None] | None = None
+
+
+# Volumetric heat capacity of air in J/(m³·K).
+AIR_HEAT_CAPACITY = 1206
+
+# Inputs of the recovered heat power and the energy counter integrating it.
+RECOVERED_POWER_INPUTS = (
+    comfoair.TEMP_OUTSIDE,
+    comfoair.TEMP_SUPPLY,
+    comfoair.AIRFLOW_SUPPLY,
+)
+
+# Below this difference between extract and outside air (K) the efficiency
+# is dominated by the resolution of the sensors.
+MIN_EFFICIENCY_DELTA = 2.0
+
+
+def heat_recovery_efficiency(
+    coordinator: "CACoordinator", outside: float, supply: float, extract: float
+) -> float | None:
+    """Return the share of the extract air heat given to the supply air in %."""
+    if abs(extract - outside) < MIN_EFFICIENCY_DELTA:
+        return None
+    return round((supply - outside) / (extract - outside) * 100, 1)
+
+
+def recovered_heat_power(
+    coordinator: "CACoordinator", outside: float, supply: float, airflow: float
+) -> float:
+    """Return the heat given to the supply air in W."""
+    volume_flow = coordinator.nominal_airflow * airflow / 100 / 3600
+    return round(AIR_HEAT_CAPACITY * volume_flow * (supply - outside))
+
+
+# Sensor jitter filtered by the deadbands.
+TEMPERATURE_DEADBAND = {"deadband": 0.5, "max_silence": 900}
+RPM_DEADBAND = {"deadband_rel": 0.02, "max_silence": 900}
+EFFICIENCY = {
+    "inputs": (comfoair.TEMP_OUTSIDE, comfoair.TEMP_SUPPLY, comfoair.TEMP_RETURN),
+    "derive": heat_recovery_efficiency,
+    "deadband": 1.0,
+    "max_silence": 900,
+}
+RECOVERED_POWER = {
+    "inputs": RECOVERED_POWER_INPUTS,
+    "derive": recovered_heat_power,
+    "deadband": 10.0,
+    "deadband_rel": 0.05,
+    "max_silence": 900,
+}
+# Grows on every power sample, see _sample_recovered_power.
+RECOVERED_ENERGY = {
+    "inputs": RECOVERED_POWER_INPUTS,
+    "state_class": SensorStateClass.TOTAL_INCREASING,
+}
+# Predicted on every running hours and filter error reading, see
+# _sample_response.
+FILTER_DUE = {
+    "inputs": (comfoair.RUNNING_HOURS_FILTER, comfoair.ERRORS_FILTER),
+    "state_class": None,
+}
+
+# One entry per device, positions index the coordinator state store.
+# fmt: off
+DEVICE_DESCRIPTIONS: tuple[DeviceDescription, ...] = (
+    DeviceDescription(1, "temperature_status_outside", "sensor", comfoair.TEMP_STATUS_OUTSIDE, SensorDeviceClass.TEMPERATURE, **TEMPERATURE_DEADBAND),
+    DeviceDescription(2, "temperature_status_supply", "sensor", comfoair.TEMP_STATUS_SUPPLY, SensorDeviceClass.TEMPERATURE, **TEMPERATURE_DEADBAND),
+    DeviceDescription(3, "temperature_status_return", "sensor", comfoair.TEMP_STATUS_RETURN, SensorDeviceClass.TEMPERATURE, **TEMPERATURE_DEADBAND),
+    DeviceDescription(4, "temperature_status_exhaust", "sensor", comfoair.TEMP_STATUS_EXHAUST, SensorDeviceClass.TEMPERATURE, **TEMPERATURE_DEADBAND),
+    DeviceDescription(5, "ventilation_set_exhaust_0", "sensor", comfoair.VENT_SET_EXHAUST_0, uom="%", icon="mdi:fan-chevron-down"),
+    DeviceDescription(6, "ventilation_set_exhaust_1", "sensor", comfoair.VENT_SET_EXHAUST_1, uom="%", icon="mdi:fan-speed-1"),
+    DeviceDescription(7, "ventilation_set_exhaust_2", "sensor", comfoair.VENT_SET_EXHAUST_2, uom="%", icon="mdi:fan-speed-2"),
+    DeviceDescription(8, "ventilation_set_supply_0", "sensor", comfoair.VENT_SET_SUPPLY_0, uom="%", icon="mdi:fan-chevron-down"),
+    DeviceDescription(9, "ventilation_set_supply_1", "sensor", comfoair.VENT_SET_SUPPLY_1, uom="%", icon="mdi:fan-speed-1"),
+    DeviceDescription(10, "ventilation_set_supply_2", "sensor", comfoair.VENT_SET_SUPPLY_2, uom="%", icon="mdi:fan-speed-2"),
+    DeviceDescription(11, "airflow_exhaust", "sensor", comfoair.AIRFLOW_EXHAUST, uom="%"),
+    DeviceDescription(12, "airflow_supply", "sensor", comfoair.AIRFLOW_SUPPLY, uom="%"),
+    DeviceDescription(13, "fan_speed_mode", "select", comfoair.FAN_SPEED_MODE),
+    DeviceDescription(14, "fan_mode_supply", "binary_sensor", comfoair.FAN_MODE_SUPPLY),
+    DeviceDescription(15, "ventilation_set_exhaust_3", "sensor", comfoair.VENT_SET_EXHAUST_3, uom="%", icon="mdi:fan-speed-3"),
+    DeviceDescription(16, "ventilation_set_supply_3", "sensor", comfoair.VENT_SET_SUPPLY_3, uom="%", icon="mdi:fan-speed-3"),
+    DeviceDescription(17, "ventilation_supply_percent", "sensor", comfoair.VENT_SUPPLY_PERC, uom="%"),
+    DeviceDescription(18, "ventilation_return_percent", "sensor", comfoair.VENT_RETURN_PERC, uom="%"),
+    DeviceDescription(19, "ventilation_supply_rpm", "sensor", comfoair.VENT_SUPPLY_RPM, uom="RPM", icon="mdi:speedometer", **RPM_DEADBAND),
+    DeviceDescription(20, "ventilation_return_rpm", "sensor", comfoair.VENT_RETURN_RPM, uom="RPM", icon="mdi:speedometer", **RPM_DEADBAND),
+    DeviceDescription(21, "bypass_status", "sensor", comfoair.BYPASS_STATUS, uom="%"),
+    DeviceDescription(22, "temperature_comfort", "sensor", comfoair.TEMP_COMFORT, SensorDeviceClass.TEMPERATURE),
+    DeviceDescription(23, "temperature_outside", "sensor", comfoair.TEMP_OUTSIDE, SensorDeviceClass.TEMPERATURE, **TEMPERATURE_DEADBAND),
+    DeviceDescription(24, "temperature_supply", "sensor", comfoair.TEMP_SUPPLY, SensorDeviceClass.TEMPERATURE, **TEMPERATURE_DEADBAND),
+    DeviceDescription(25, "temperature_return", "sensor", comfoair.TEMP_RETURN, SensorDeviceClass.TEMPERATURE, **TEMPERATURE_DEADBAND),
+    DeviceDescription(26, "temperature_exhaust", "sensor", comfoair.TEMP_EXHAUST, SensorDeviceClass.TEMPERATURE, **TEMPERATURE_DEADBAND),
+    DeviceDescription(27, "errors_filter", "sensor", comfoair.ERRORS_FILTER, icon="mdi:message-alert"),
+    DeviceDescription(28, "running_hours_filter", "sensor", comfoair.RUNNING_HOURS_FILTER, SensorDeviceClass.DURATION, uom="d"),
+    DeviceDescription(29, "set_comfort_temperature", "climate", comfoair.TEMP_COMFORT),
+    DeviceDescription(30, "heat_recovery_efficiency", "sensor", None, uom="%", icon="mdi:heat-wave", **EFFICIENCY),
+    DeviceDescription(31, "recovered_heat_power", "sensor", None, SensorDeviceClass.POWER, uom="W", **RECOVERED_POWER),
+    DeviceDescription(32, "recovered_heat_energy", "sensor", None, SensorDeviceClass.ENERGY, uom="kWh", **RECOVERED_ENERGY),
+    DeviceDescription(33, "filter_due", "sensor", None, SensorDeviceClass.TIMESTAMP, icon="mdi:air-filter", **FILTER_DUE),
+)
+# fmt: on
+
+# Sensors whose recent values are kept for get_history.
+HISTORY_DEVICES = tuple(
+    description.name
+    for description in DEVICE_DESCRIPTIONS
+    if description.device_type == "sensor" and description.ca_response is not None
+)
+
+
+class Device:
+    """API device.
+
+    Binds a static description to its slot in the coordinator state store,
+    the live values of all devices are kept in one list indexed by position.
+    """
+
+    __slots__ = ("_states", "description", "position", "responses")
+
+    def __init__(
+        self, description: DeviceDescription, states: list[typing.Any], position: int
+    ) -> None:
+        """Initialise device."""
+        self.description = description
+        self.position = position
+        self._states = states
+        # Response attributes the value depends on.
+        self.responses = description.inputs or (description.ca_response,)
+
+    def __repr__(self) -> str:
+        """Return the device with its current state."""
+        return f"Device({self.description.name}={self.state!r})"
+
+    @property
+    def device_id(self) -> int:
+        """Return the device id."""
+        return self.description.device_id
+
+    @property
+    def device_unique_id(self) -> str:
+        """Return the unique id."""
+        return self.description.name
+
+    @property
+    def device_class(self) -> str | None:
+        """Return the device class."""
+        return self.description.device_class
+
+    @property
+    def device_type(self) -> str:
+        """Return the platform of the device."""
+        return self.description.device_type
+
+    @property
+    def name(self) -> str:
+        """Return the name."""
+        return self.description.name
+
+    @property
+    def ca_response(self) -> comfoair.CAReponse | None:
+        """Return the response attribute feeding the device."""
+        return self.description.ca_response
+
+    @property
+    def uom(self) -> str | None:
+        """Return the unit of measurement."""
+        return self.description.uom
+
+    @property
+    def icon(self) -> str | None:
+        """Return the icon."""
+        return self.description.icon
+
+    @property
+    def state_class(self) -> str | None:
+        """Return the state class."""
+        return self.description.state_class
+
+    @property
+    def state(self) -> typing.Any:
+        """Return the current value."""
+        return self._states[self.position]
+
+    @state.setter
+    def state(self, value: typing.Any) -> None:
+        self._states[self.position] = value
+
+    @property
+    def key(self) -> tuple[str, int]:
+        """Return the key identifying this device across platforms."""
+        return self.device_type, self.device_id
+
+
+@dataclass(frozen=True)
+class RequestGroup:
+    """A poll command, the response frame that answers it and its schedule.
+
+    Due groups are queued on the bus in table order, the bus sends them by
+    priority class.
+    """
+
+    key: str
+    request: typing.Callable[[comfoair.async_api.ComfoAir], typing.Awaitable[None]]
+    response_cmd: int
+    # Groups sent on demand only leave the interval at zero.
+    interval: int = 0
+    priority: Priority = Priority.POLL
+
+    @property
+    def last_response(self) -> comfoair.CAReponse:
+        """Return the last attribute decoded from the response frame."""
+        return comfoair.RESPONSES[self.response_cmd][-1]
+
+
+# Poll commands with their default interval (seconds) and bus priority.
+# Fast changing fan data is polled often, counters only now and then. In
+# total about five commands a minute, less than the former single poll cycle
+# sent with its default scan interval.
+REQUEST_GROUPS: tuple[RequestGroup, ...] = (
+    RequestGroup(
+        "ventilation_status",
+        comfoair.async_api.ComfoAir.request_ventilation_status,
+        comfoair.VENT_SUPPLY_PERC.cmd,
+        interval=30,
+        priority=Priority.POLL,
+    ),
+    RequestGroup(
+        "temperature_status",
+        comfoair.async_api.ComfoAir.request_temperature_status,
+        comfoair.TEMP_STATUS_OUTSIDE.cmd,
+        interval=60,
+        priority=Priority.POLL,
+    ),
+    RequestGroup(
+        "temperatures",
+        comfoair.async_api.ComfoAir.request_temperatures,
+        comfoair.TEMP_COMFORT.cmd,
+        interval=60,
+        priority=Priority.POLL,
+    ),
+    RequestGroup(
+        "bypass_status",
+        comfoair.async_api.ComfoAir.request_bypass_status,
+        comfoair.BYPASS_STATUS.cmd,
+        interval=120,
+        priority=Priority.POLL,
+    ),
+    RequestGroup(
+        "ventilation_set",
+        comfoair.async_api.ComfoAir.request_ventilation_set,
+        comfoair.FAN_SPEED_MODE.cmd,
+        interval=120,
+        priority=Priority.POLL,
+    ),
+    RequestGroup(
+        "errors",
+        comfoair.async_api.ComfoAir.request_errors,
+        comfoair.ERRORS_FILTER.cmd,
+        interval=3600,
+        priority=Priority.DIAGNOSTIC,
+    ),
+    RequestGroup(
+        "running_hours",
+        comfoair.async_api.ComfoAir.request_running_hours,
+        comfoair.RUNNING_HOURS_FILTER.cmd,
+        interval=3600,
+        priority=Priority.DIAGNOSTIC,
+    ),
+)
+
+# Identification of the unit, requested once at setup.
+VERSION_GROUPS: tuple[RequestGroup, ...] = (
+    RequestGroup(
+        "firmware_version",
+        comfoair.async_api.ComfoAir.request_firmware_version,
+        comfoair.FIRMWARE_NAME.cmd,
+        priority=Priority.DIAGNOSTIC,
+    ),
+    RequestGroup(
+        "bootloader_version",
+        comfoair.async_api.ComfoAir.request_bootloader_version,
+        comfoair.BOOTLOADER_NAME.cmd,
+        priority=Priority.DIAGNOSTIC,
+    ),
+    RequestGroup(
+        "connector_board_version",
+        comfoair.async_api.ComfoAir.request_version,
+        comfoair.CONNECTOR_BOARD_NAME.cmd,
+        priority=Priority.DIAGNOSTIC,
+    ),
+)
 
 
 @dataclass
@@ -43,6 +475,8 @@ class CAAPIData:
 
     controller_name: str
     devices: list[Device]
+    # Devices keyed by (device_type, device_id) for entity lookups.
+    index: dict[tuple[str, int], Device]
 
 
 class CACoordinator(DataUpdateCoordinator):
@@ -58,28 +492,135 @@ class CACoordinator(DataUpdateCoordinator):
         self.port = config_entry.data[CONF_PORT]
 
         # set variables from options.  You need a default here incase options have not been set
-        self.poll_interval = config_entry.options.get(
-            CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+        self.group_intervals = {
+            group.key: config_entry.options.get(
+                conf_group_interval(group.key), group.interval
+            )
+            for group in REQUEST_GROUPS
+        }
+        # Monotonic time at which each group is due again, all due at start.
+        self._next_poll = dict.fromkeys(self.group_intervals, 0.0)
+
+        # Adaptive polling: the interval of a group follows the rate of change
+        # of its values, from its configured interval divided by the adaptive
+        # factor for busy groups up to the interval times the factor.
+        self.adaptive_polling = config_entry.options.get(
+            CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+        )
+        adaptive_max_factor = (
+            config_entry.options.get(
+                CONF_ADAPTIVE_MAX_FACTOR, DEFAULT_ADAPTIVE_MAX_FACTOR
+            )
+            if self.adaptive_polling
+            else 1
+        )
+        self._min_intervals = {
+            key: max(round(interval / adaptive_max_factor), MIN_SCAN_INTERVAL)
+            for key, interval in self.group_intervals.items()
+        }
+        self._max_intervals = {
+            key: min(interval * adaptive_max_factor, MAX_SCAN_INTERVAL)
+            for key, interval in self.group_intervals.items()
+        }
+        # Current interval per group, its smoothed changed values per second
+        # and the changed values per response command since the last poll.
+        self.intervals = dict(self.group_intervals)
+        self._change_rates = {
+            key: ADAPTIVE_CHANGES_PER_POLL / interval
+            for key, interval in self.group_intervals.items()
+        }
+        self._response_changes: dict[int, int] = {}
+        self._polled_at: dict[str, float] = {}
+        # Airflow of the unit at 100 % in m³/h, scales the airflow percentages.
+        self.nominal_airflow = config_entry.options.get(
+            CONF_NOMINAL_AIRFLOW, DEFAULT_NOMINAL_AIRFLOW
         )
+        # Oldest acceptable value per response command, in seconds.
+        max_age_polls = config_entry.options.get(
+            CONF_MAX_AGE_POLLS, DEFAULT_MAX_AGE_POLLS
+        )
+        self._max_age = {
+            group.response_cmd: max_age_polls * self._max_intervals[group.key]
+            for group in REQUEST_GROUPS
+        }
 
         # Initialise DataUpdateCoordinator
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=config_entry,
             name=f"{DOMAIN} ({config_entry.unique_id})",
             # Method to call on every update interval.
             update_method=self.async_update_data,
             # Polling interval. Will only be polled if there are subscribers.
-            # Using config option here but you can just use a value.
-            update_interval=timedelta(seconds=self.poll_interval),
+            # Ticks at the fastest group interval, slower groups skip ticks.
+            update_interval=timedelta(seconds=min(self.group_intervals.values())),
+        )
+
+        # Every command to the unit goes through the bus: pause between two
+        # frames and how long to wait for the unit to answer a single command.
+        self.bus = CABus(
+            guard_time=config_entry.options.get(CONF_GUARD_TIME, DEFAULT_GUARD_TIME),
+            command_timeout=config_entry.options.get(
+                CONF_COMMAND_TIMEOUT, DEFAULT_COMMAND_TIMEOUT
+            ),
+            reconnect=self._async_reconnect,
         )
+        # Latest pending write per target with the group to read back after it.
+        self._pending_writes: dict[
+            str, tuple[typing.Callable[[], typing.Awaitable[None]], str]
+        ] = {}
+        self._write_task: asyncio.Task | None = None
 
+        # Live values of all devices, indexed by their description position.
+        self.states: list[typing.Any] = [None] * len(DEVICE_DESCRIPTIONS)
         self.devices: list[Device] = []
+        # Devices fed by each response attribute, see init_devices.
+        self._devices_by_response: dict[tuple[int, int], list[Device]] = {}
+        # Response commands feeding the recovered energy counter.
+        self._energy_cmds = {attribute.cmd for attribute in RECOVERED_POWER_INPUTS}
+        # Derived devices by input attribute and the last value of each input.
+        self._derived_by_input: dict[tuple[int, int], list[Device]] = {}
+        self._input_values: dict[tuple[int, int], typing.Any] = {}
+        self._device_index: dict[tuple[str, int], Device] = {}
+        # Recent samples per response attribute and the sensors reading them.
+        self._history: dict[tuple[int, int], SampleBuffer] = {}
+        self._history_by_name: dict[str, SampleBuffer] = {}
+        # Monotonic time each device value was last published.
+        self._published: list[float] = [0.0] * len(DEVICE_DESCRIPTIONS)
+        # Keys of the devices whose state changed since listeners were last notified.
+        self._changed: set[tuple[str, int]] = set()
+        self._notified_success: bool | None = None
+        # Response commands of the request groups whose last poll failed.
+        self._stale_responses: set[int] = set()
+        # Monotonic time each response attribute was last received.
+        self._received: dict[tuple[int, int], float] = {}
+        # Keys of the devices whose value is older than its max age.
+        self._expired: set[tuple[str, int]] = set()
 
         # Initialise your api here
         self.api_url = f"socket://{self.host}:{self.port}"
-        self.api = comfoair.async_api.ComfoAir(self.api_url)
+        self.api = CAClient(self.api_url)
         self.api.add_attr_event_listener(self.ca_attr_event)
+        self.api.add_listener(self._async_frame_received)
+
+        # Bus statistics, see _record_cycle.
+        self.cycle_duration: float | None = None
+        self.frames_received = 0
+        self.frames_per_second: float | None = None
+        self.attr_event_seconds = 0.0
+        self.attr_event_time: float | None = None
+        self._cycle_mark: tuple[float, int, float] | None = None
+
+        self._attribute_logger = AttributeLogger(self.logger)
+
+        # Post mortem data for the diagnostics, with wall clock timestamps.
+        self.attribute_log: RingBuffer[tuple[float, str, typing.Any]] = RingBuffer(
+            ATTRIBUTE_LOG_SIZE
+        )
+        self.frame_log: RingBuffer[tuple[float, int, bytes]] = RingBuffer(
+            FRAME_LOG_SIZE
+        )
 
         # device information
         self.di_name = "unknown"
@@ -89,6 +630,33 @@ class CACoordinator(DataUpdateCoordinator):
         self.di_device_id = self.host
         self.di_controller_name = "comfoair"
 
+        # Device information of the last start, see _async_setup.
+        self._store: Store[dict[str, typing.Any]] = Store(
+            hass, STORAGE_VERSION, f"{STORAGE_KEY}.{config_entry.entry_id}"
+        )
+        self._stored_device_info: dict[str, typing.Any] | None = None
+
+        # Heat recovered since the integration was added, kept across restarts.
+        # Gaps longer than the max age of the inputs are not integrated.
+        self.recovered_energy = EnergyIntegrator(
+            max(self._max_age[attribute.cmd] for attribute in RECOVERED_POWER_INPUTS)
+        )
+        self._energy_store: Store[dict[str, float]] = Store(
+            hass, STORAGE_VERSION, f"{ENERGY_STORAGE_KEY}.{config_entry.entry_id}"
+        )
+
+        # Filter wear and its trend, kept across restarts.
+        self.filter_predictor = FilterPredictor(
+            config_entry.options.get(CONF_FILTER_LIFE, DEFAULT_FILTER_LIFE),
+            self.group_intervals["running_hours"],
+        )
+        self._filter_store: Store[dict[str, typing.Any]] = Store(
+            hass, STORAGE_VERSION, f"{FILTER_STORAGE_KEY}.{config_entry.entry_id}"
+        )
+        # Only save the counters once they were loaded, not after a failed setup.
+        self._counters_loaded = False
+        self.first_poll_deferred = False
+
     async def _async_setup(self):
         """Set up the coordinator
 
@@ -100,387 +668,214 @@ class CACoordinator(DataUpdateCoordinator):
         """
         if not self.api.running:
             await self.api.connect()
+        self.bus.start(self.hass, self.config_entry)
 
-        await self.api.request_firmware_version()
-        await asyncio.sleep(1)
-        await self.api.request_bootloader_version()
-        await asyncio.sleep(1)
-        await self.api.request_version()
-        await asyncio.sleep(1)
+        self._stored_device_info = await self._store.async_load()
+        if self._stored_device_info:
+            # Known unit: reuse its identification, confirm it and run the
+            # first poll in the background instead of blocking startup.
+            self.di_name = self._stored_device_info["name"]
+            self.di_model = self._stored_device_info["model"]
+            self.di_sw_version = self._stored_device_info["sw_version"]
+            self.first_poll_deferred = True
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self._async_refresh_device_info(),
+                f"{self.name} device info",
+            )
+        else:
+            await self._async_refresh_device_info()
+
+        if stored_energy := await self._energy_store.async_load():
+            self.recovered_energy.total = stored_energy["recovered_heat"]
+        if stored_filter := await self._filter_store.async_load():
+            self.filter_predictor.restore(stored_filter)
+        self._counters_loaded = True
 
         self.init_devices()
+        self._update_filter_due()
 
-    def init_devices(self) -> None:
-        self.devices.append(
-            Device(
-                device_id=1,
-                device_unique_id="temperature_status_outside",
-                device_class=SensorDeviceClass.TEMPERATURE,
-                device_type="sensor",
-                name="temperature_status_outside",
-                ca_response=comfoair.TEMP_STATUS_OUTSIDE,
-                state=None,
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=2,
-                device_unique_id="temperature_status_supply",
-                device_class=SensorDeviceClass.TEMPERATURE,
-                device_type="sensor",
-                name="temperature_status_supply",
-                ca_response=comfoair.TEMP_STATUS_SUPPLY,
-                state=None,
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=3,
-                device_unique_id="temperature_status_return",
-                device_class=SensorDeviceClass.TEMPERATURE,
-                device_type="sensor",
-                name="temperature_status_return",
-                ca_response=comfoair.TEMP_STATUS_RETURN,
-                state=None,
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=4,
-                device_unique_id="temperature_status_exhaust",
-                device_class=SensorDeviceClass.TEMPERATURE,
-                device_type="sensor",
-                name="temperature_status_exhaust",
-                ca_response=comfoair.TEMP_STATUS_EXHAUST,
-                state=None,
-            )
-        )
+    async def _async_refresh_device_info(self) -> None:
+        """Request the unit identification and store it for the next start."""
+        try:
+            for group in VERSION_GROUPS:
+                await self._async_request(group)
+        except UpdateFailed as err:
+            self.logger.warning("Unable to read device information: %s", err)
+            return
 
-        self.devices.append(
-            Device(
-                device_id=5,
-                device_unique_id="ventilation_set_exhaust_0",
-                device_class=None,
-                device_type="sensor",
-                name="ventilation_set_exhaust_0",
-                ca_response=comfoair.VENT_SET_EXHAUST_0,
-                state=None,
-                uom="%",
-                icon="mdi:fan-chevron-down",
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=6,
-                device_unique_id="ventilation_set_exhaust_1",
-                device_class=None,
-                device_type="sensor",
-                name="ventilation_set_exhaust_1",
-                ca_response=comfoair.VENT_SET_EXHAUST_1,
-                state=None,
-                uom="%",
-                icon="mdi:fan-speed-1",
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=7,
-                device_unique_id="ventilation_set_exhaust_2",
-                device_class=None,
-                device_type="sensor",
-                name="ventilation_set_exhaust_2",
-                ca_response=comfoair.VENT_SET_EXHAUST_2,
-                state=None,
-                uom="%",
-                icon="mdi:fan-speed-2",
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=8,
-                device_unique_id="ventilation_set_supply_0",
-                device_class=None,
-                device_type="sensor",
-                name="ventilation_set_supply_0",
-                ca_response=comfoair.VENT_SET_SUPPLY_0,
-                state=None,
-                uom="%",
-                icon="mdi:fan-chevron-down",
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=9,
-                device_unique_id="ventilation_set_supply_1",
-                device_class=None,
-                device_type="sensor",
-                name="ventilation_set_supply_1",
-                ca_response=comfoair.VENT_SET_SUPPLY_1,
-                state=None,
-                uom="%",
-                icon="mdi:fan-speed-1",
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=10,
-                device_unique_id="ventilation_set_supply_2",
-                device_class=None,
-                device_type="sensor",
-                name="ventilation_set_supply_2",
-                ca_response=comfoair.VENT_SET_SUPPLY_2,
-                state=None,
-                uom="%",
-                icon="mdi:fan-speed-2",
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=11,
-                device_unique_id="airflow_exhaust",
-                device_class=None,
-                device_type="sensor",
-                name="airflow_exhaust",
-                ca_response=comfoair.AIRFLOW_EXHAUST,
-                state=None,
-                uom="%",
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=12,
-                device_unique_id="airflow_supply",
-                device_class=None,
-                device_type="sensor",
-                name="airflow_supply",
-                ca_response=comfoair.AIRFLOW_SUPPLY,
-                state=None,
-                uom="%",
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=13,
-                device_unique_id="fan_speed_mode",
-                device_class=None,
-                device_type="select",
-                name="fan_speed_mode",
-                ca_response=comfoair.FAN_SPEED_MODE,
-                state=None,
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=14,
-                device_unique_id="fan_mode_supply",
-                device_class=None,
-                device_type="binary_sensor",
-                name="fan_mode_supply",
-                ca_response=comfoair.FAN_MODE_SUPPLY,
-                state=None,
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=15,
-                device_unique_id="ventilation_set_exhaust_3",
-                device_class=None,
-                device_type="sensor",
-                name="ventilation_set_exhaust_3",
-                ca_response=comfoair.VENT_SET_EXHAUST_3,
-                state=None,
-                uom="%",
-                icon="mdi:fan-speed-3",
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=16,
-                device_unique_id="ventilation_set_supply_3",
-                device_class=None,
-                device_type="sensor",
-                name="ventilation_set_supply_3",
-                ca_response=comfoair.VENT_SET_SUPPLY_3,
-                state=None,
-                uom="%",
-                icon="mdi:fan-speed-3",
-            )
-        )
+        device_info = {
+            "name": self.di_name,
+            "model": self.di_model,
+            "sw_version": self.di_sw_version,
+        }
+        if device_info == self._stored_device_info:
+            return
 
-        self.devices.append(
-            Device(
-                device_id=17,
-                device_unique_id="ventilation_supply_percent",
-                device_class=None,
-                device_type="sensor",
-                name="ventilation_supply_percent",
-                ca_response=comfoair.VENT_SUPPLY_PERC,
-                state=None,
-                uom="%",
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=18,
-                device_unique_id="ventilation_return_percent",
-                device_class=None,
-                device_type="sensor",
-                name="ventilation_return_percent",
-                ca_response=comfoair.VENT_RETURN_PERC,
-                state=None,
-                uom="%",
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=19,
-                device_unique_id="ventilation_supply_rpm",
-                device_class=None,
-                device_type="sensor",
-                name="ventilation_supply_rpm",
-                ca_response=comfoair.VENT_SUPPLY_RPM,
-                state=None,
-                uom="RPM",
-                icon="mdi:speedometer",
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=20,
-                device_unique_id="ventilation_return_rpm",
-                device_class=None,
-                device_type="sensor",
-                name="ventilation_return_rpm",
-                ca_response=comfoair.VENT_RETURN_RPM,
-                state=None,
-                uom="RPM",
-                icon="mdi:speedometer",
-            )
-        )
+        self._stored_device_info = device_info
+        await self._store.async_save(device_info)
 
-        self.devices.append(
-            Device(
-                device_id=21,
-                device_unique_id="bypass_status",
-                device_class=None,
-                device_type="sensor",
-                name="bypass_status",
-                ca_response=comfoair.BYPASS_STATUS,
-                state=None,
-                uom="%",
+        # Entities may already be registered with outdated information.
+        device_registry = dr.async_get(self.hass)
+        if device := device_registry.async_get_device(
+            identifiers=self.device_info()["identifiers"]
+        ):
+            device_registry.async_update_device(
+                device.id,
+                name=self.di_name,
+                model=self.di_model,
+                sw_version=self.di_sw_version,
             )
-        )
 
-        self.devices.append(
-            Device(
-                device_id=22,
-                device_unique_id="temperature_comfort",
-                device_class=SensorDeviceClass.TEMPERATURE,
-                device_type="sensor",
-                name="temperature_comfort",
-                ca_response=comfoair.TEMP_COMFORT,
-                state=None,
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=23,
-                device_unique_id="temperature_outside",
-                device_class=SensorDeviceClass.TEMPERATURE,
-                device_type="sensor",
-                name="temperature_outside",
-                ca_response=comfoair.TEMP_OUTSIDE,
-                state=None,
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=24,
-                device_unique_id="temperature_supply",
-                device_class=SensorDeviceClass.TEMPERATURE,
-                device_type="sensor",
-                name="temperature_supply",
-                ca_response=comfoair.TEMP_SUPPLY,
-                state=None,
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=25,
-                device_unique_id="temperature_return",
-                device_class=SensorDeviceClass.TEMPERATURE,
-                device_type="sensor",
-                name="temperature_return",
-                ca_response=comfoair.TEMP_RETURN,
-                state=None,
-            )
-        )
-        self.devices.append(
-            Device(
-                device_id=26,
-                device_unique_id="temperature_exhaust",
-                device_class=SensorDeviceClass.TEMPERATURE,
-                device_type="sensor",
-                name="temperature_exhaust",
-                ca_response=comfoair.TEMP_EXHAUST,
-                state=None,
-            )
-        )
+    def init_devices(self) -> None:
+        """Bind the device descriptions to their slots in the state store."""
+        self.devices = [
+            Device(description, self.states, position)
+            for position, description in enumerate(DEVICE_DESCRIPTIONS)
+        ]
 
-        self.devices.append(
-            Device(
-                device_id=27,
-                device_unique_id="errors_filter",
-                device_class=None,
-                device_type="sensor",
-                name="errors_filter",
-                ca_response=comfoair.ERRORS_FILTER,
-                state=None,
-                icon="mdi:message-alert",
-            )
-        )
+        # Dispatch index for ca_attr_event, one response may feed several devices.
+        for device in self.devices:
+            self._device_index[device.key] = device
+            if device.ca_response is not None:
+                self._devices_by_response.setdefault(
+                    response_key(device.ca_response), []
+                ).append(device)
+                continue
+            if device.description.derive is None:
+                # Updated by the coordinator, see _sample_response.
+                continue
+            for attribute in device.description.inputs:
+                self._derived_by_input.setdefault(response_key(attribute), []).append(
+                    device
+                )
 
-        self.devices.append(
-            Device(
-                device_id=28,
-                device_unique_id="running_hours_filter",
-                device_class=SensorDeviceClass.DURATION,
-                device_type="sensor",
-                name="running_hours_filter",
-                ca_response=comfoair.RUNNING_HOURS_FILTER,
-                state=None,
-                uom="d",
-            )
-        )
+        for device in self.devices:
+            if device.name in HISTORY_DEVICES:
+                key = response_key(device.ca_response)
+                if key not in self._history:
+                    self._history[key] = SampleBuffer(HISTORY_SIZE)
+                self._history_by_name[device.name] = self._history[key]
 
-        self.devices.append(
-            Device(
-                device_id=29,
-                device_unique_id="set_comfort_temperature",
-                device_class=None,
-                device_type="climate",
-                name="set_comfort_temperature",
-                ca_response=comfoair.TEMP_COMFORT,
-                state=None,
-            )
-        )
+        devices_by_name = {device.name: device for device in self.devices}
+        self._energy_device = devices_by_name["recovered_heat_energy"]
+        self._filter_due_device = devices_by_name["filter_due"]
+
+    async def _async_frame_received(self, frame: list[typing.Any]) -> None:
+        """Count and keep the frames received from the unit."""
+        self.frames_received += 1
+        self.frame_log.append((time.time(), frame[0], frame[1]))
 
     async def ca_attr_event(
         self, attribute: comfoair.CAReponse, value: typing.Any
     ) -> None:
-        self.logger.info("Attribute %s: %s", attribute, value)
+        started = time.perf_counter()
+        try:
+            key = response_key(attribute)
+            self._attribute_logger.log(key, attribute, value)
+            self.attribute_log.append((time.time(), attribute.label, value))
+
+            # Complete the running bus command once its response is decoded.
+            self.bus.attribute_received(attribute)
+
+            if attribute == comfoair.FIRMWARE_NAME:
+                self.di_name = value
+                self.di_model = value
+                return
+            if attribute == comfoair.FIRMWARE_VERSION:
+                self.di_sw_version = value
+                return
+
+            now = self._received[key] = time.monotonic()
+            if (history := self._history.get(key)) is not None:
+                history.append(time.time(), value)
+
+            for device in self._devices_by_response.get(key, ()):
+                if self._update_state(device, value, now):
+                    self._response_changes[attribute.cmd] = (
+                        self._response_changes.get(attribute.cmd, 0) + 1
+                    )
+
+            # Derived values are only computed when one of their inputs changed.
+            if key in self._derived_by_input and self._input_values.get(key) != value:
+                self._input_values[key] = value
+                for device in self._derived_by_input[key]:
+                    self._update_state(device, self._derive(device), now)
+        finally:
+            self.attr_event_seconds += time.perf_counter() - started
+
+    def _update_state(self, device: Device, value: typing.Any, now: float) -> bool:
+        """Store a new device value and flag it for publishing.
 
-        if attribute == comfoair.FIRMWARE_NAME:
-            self.di_name = value
-            self.di_model = value
+        Returns whether the value changed beyond its deadband.
+        """
+        if device.state == value or not self._exceeds_deadband(device, value, now):
+            return False
+
+        device.state = value
+        self._published[device.position] = now
+        self._changed.add(device.key)
+        return True
+
+    def _derive(self, device: Device) -> float | None:
+        """Compute a derived device value, None while an input is unknown."""
+        values = [
+            self._input_values.get(response_key(attribute))
+            for attribute in device.description.inputs
+        ]
+        if None in values:
+            return None
+        return device.description.derive(self, *values)
+
+    def _exceeds_deadband(self, device: Device, value: typing.Any, now: float) -> bool:
+        """Return if a changed value differs enough from the published one."""
+        description = device.description
+        if not (description.deadband or description.deadband_rel):
+            return True
+        if device.state is None or value is None:
+            return True
+
+        threshold = max(
+            description.deadband, description.deadband_rel * abs(device.state)
+        )
+        if abs(value - device.state) > threshold:
+            return True
+        # Publish a small change anyway once the sensor was silent for long.
+        return (
+            description.max_silence is not None
+            and now - self._published[device.position] >= description.max_silence
+        )
+
+    @callback
+    def _async_publish_changes(self) -> None:
+        """Push the values of a completed response group to their entities.
+
+        Called in the middle of a poll cycle, so entities see a new value one
+        round trip after it was requested rather than at the end of the cycle.
+        """
+        # Nothing is listening before the first refresh has completed.
+        if self.data is None or not self._changed:
             return
-        if attribute == comfoair.FIRMWARE_VERSION:
-            self.di_sw_version = value
+        self.async_update_listeners()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update only the entities whose device state changed.
+
+        Entities register with their device key as listener context. All of
+        them are notified when the update success flips, so availability is
+        written as well.
+        """
+        changed, self._changed = self._changed, set()
+
+        if self.last_update_success != self._notified_success:
+            self._notified_success = self.last_update_success
+            super().async_update_listeners()
             return
 
-        for device in self.devices:
-            if device.ca_response == attribute:
-                device.state = value
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in changed:
+                update_callback()
 
     def device_info(self) -> DeviceInfo:
         """Return device information."""
@@ -506,48 +901,373 @@ class CACoordinator(DataUpdateCoordinator):
         This is the place to pre-process the data to lookup tables
         so entities can quickly look up their data.
         """
+        if self.first_poll_deferred and self.data is None:
+            # Publish the devices of a known unit right away, the first poll
+            # is started once the platforms are set up.
+            return CAAPIData(self.di_controller_name, self.devices, self._device_index)
+
+        started = time.monotonic()
         try:
             if not self.api.running:
                 await self.api.connect()
 
-            # await self.hass.async_add_executor_job(self.api.request_temperature_status)
-            await self.api.request_temperature_status()
-            await asyncio.sleep(2)
-            await self.api.request_ventilation_status()
-            await asyncio.sleep(2)
-            await self.api.request_bypass_status()
-            await asyncio.sleep(2)
-            await self.api.request_ventilation_set()
-            await asyncio.sleep(2)
-            await self.api.request_temperatures()
-            await asyncio.sleep(2)
-            await self.api.request_errors()
-            await asyncio.sleep(2)
-            await self.api.request_running_hours()
+            # Queue all due groups at once, writes still jump ahead of them.
+            results = await asyncio.gather(
+                *(self._async_poll_group(group) for group in self._due_groups())
+            )
+            # A single failing group only stales its own devices.
+            if results and not any(results):
+                raise UpdateFailed("No request group answered")
+
+            # Values of groups not polled in this update age as well.
+            self._check_expired()
 
+            if self.adaptive_polling:
+                # Wake up when the next group is due instead of at a fixed tick.
+                next_due = min(self._next_poll.values()) - time.monotonic()
+                self.update_interval = timedelta(
+                    seconds=max(next_due, min(self._min_intervals.values()))
+                )
+
+        except UpdateFailed:
+            raise
         except Exception as err:
             # This will show entities as unavailable by raising UpdateFailed exception
             raise UpdateFailed(f"Error communicating with API: {err}") from err
+        finally:
+            self._record_cycle(started)
 
         # What is returned here is stored in self.data by the DataUpdateCoordinator
-        return CAAPIData(self.di_controller_name, self.devices)
+        return CAAPIData(self.di_controller_name, self.devices, self._device_index)
+
+    def _record_cycle(self, started: float) -> None:
+        """Update the bus statistics at the end of a poll cycle."""
+        now = time.monotonic()
+        self.cycle_duration = now - started
+        if self._cycle_mark is not None:
+            mark_time, mark_frames, mark_attr_event = self._cycle_mark
+            self.frames_per_second = (self.frames_received - mark_frames) / (
+                now - mark_time
+            )
+            self.attr_event_time = self.attr_event_seconds - mark_attr_event
+        self._cycle_mark = now, self.frames_received, self.attr_event_seconds
+        self._changed.add(DIAGNOSTICS_KEY)
+
+    def history(
+        self, name: str, start: float, window: float
+    ) -> list[tuple[float, float, float, float, int]]:
+        """Return min, max and mean of a sensor per window since start."""
+        return self._history_by_name[name].windows(start, window)
+
+    def statistics(self) -> dict[str, typing.Any]:
+        """Return the bus statistics and the state of the request groups."""
+        return {
+            # Across all commands, like the bus_latency sensors.
+            "bus_latency_p50": self.bus.latency(0.5),
+            "bus_latency_p95": self.bus.latency(0.95),
+            "bus_latency_max": self.bus.latency(1.0),
+            "group_latency_p95": {
+                group.key: self.bus.latency(0.95, group.response_cmd)
+                for group in REQUEST_GROUPS
+            },
+            "cycle_duration": self.cycle_duration,
+            "frames_received": self.frames_received,
+            "frames_per_second": self.frames_per_second,
+            "timeouts": self.bus.timeouts,
+            "checksum_errors": self.api.checksum_errors,
+            "reconnects": self.bus.reconnects,
+            "stalled": self.bus.stalled,
+            "attr_event_seconds": self.attr_event_seconds,
+            "attr_event_time": self.attr_event_time,
+            "intervals": self.intervals,
+            "stale_groups": [
+                group.key
+                for group in REQUEST_GROUPS
+                if group.response_cmd in self._stale_responses
+            ],
+            "expired_devices": sorted(
+                self._device_index[key].name for key in self._expired
+            ),
+        }
+
+    async def async_refresh_groups(self, *keys: str) -> None:
+        """Read back only the given request groups, e.g. after a write.
+
+        Much cheaper than a full refresh, the changes are published as soon
+        as the responses are decoded.
+        """
+        await asyncio.gather(
+            *(
+                self._async_poll_group(group, Priority.READBACK)
+                for group in REQUEST_GROUPS
+                if group.key in keys
+            )
+        )
+
+    def _due_groups(self) -> list[RequestGroup]:
+        """Return the groups to poll in this update."""
+        deadline = time.monotonic() + SCHEDULE_SLACK
+        return [
+            group for group in REQUEST_GROUPS if self._next_poll[group.key] <= deadline
+        ]
+
+    async def _async_poll_group(
+        self, group: RequestGroup, priority: Priority | None = None
+    ) -> bool:
+        """Poll a request group and publish its changes.
+
+        Retries up to GROUP_RETRIES times, then marks the devices of the group
+        stale until it answers again. Returns whether the group answered.
+        """
+        for attempt in range(GROUP_RETRIES + 1):
+            try:
+                await self._async_request(group, priority)
+            except UpdateFailed as err:
+                self.logger.debug("%s, attempt %d", err, attempt + 1)
+                continue
+
+            self._next_poll[group.key] = time.monotonic() + self._adapt_interval(group)
+            self._set_group_stale(group, False)
+            self._sample_response(group.response_cmd)
+            self._check_expired()
+            self._async_publish_changes()
+            return True
+
+        # Left due, so the group is tried again on the next update.
+        self._set_group_stale(group, True)
+        self._check_expired()
+        self._async_publish_changes()
+        return False
+
+    def _adapt_interval(self, group: RequestGroup) -> float:
+        """Return the seconds until the next poll of a group.
+
+        With adaptive polling the interval is chosen so that about
+        ADAPTIVE_CHANGES_PER_POLL values of the group change between two
+        polls: a group changing quickly is polled faster than configured, a
+        quiet one slower, within its adaptive range.
+        """
+        changes = self._response_changes.pop(group.response_cmd, 0)
+        now = time.monotonic()
+        last, self._polled_at[group.key] = self._polled_at.get(group.key), now
+        if not self.adaptive_polling:
+            return self.group_intervals[group.key]
+        if last is None:
+            # The first values of a group are no change.
+            return self.intervals[group.key]
+
+        # A read back right after a write counts as a poll at the fastest
+        # interval, not as a burst of changes.
+        elapsed = max(now - last, self._min_intervals[group.key])
+        rate = (1 - ADAPTIVE_SMOOTHING) * self._change_rates[group.key]
+        rate += ADAPTIVE_SMOOTHING * changes / elapsed
+        self._change_rates[group.key] = rate
+
+        interval = round(ADAPTIVE_CHANGES_PER_POLL / rate) if rate > 0 else math.inf
+        interval = min(
+            max(interval, self._min_intervals[group.key]),
+            self._max_intervals[group.key],
+        )
+        if interval != self.intervals[group.key]:
+            self.logger.debug("Polling %s every %.0f s", group.key, interval)
+            self.intervals[group.key] = interval
+        return interval
+
+    def _sample_response(self, response_cmd: int) -> None:
+        """Feed the counters and predictions with a complete response frame."""
+        if response_cmd in self._energy_cmds:
+            self._sample_recovered_power()
+
+        if response_cmd == comfoair.VENT_SUPPLY_PERC.cmd:
+            levels = [
+                self._device_state(attribute)
+                for attribute in (comfoair.VENT_SUPPLY_PERC, comfoair.VENT_RETURN_PERC)
+            ]
+            if None not in levels:
+                self.filter_predictor.add_level(sum(levels) / len(levels))
+
+        elif response_cmd == comfoair.RUNNING_HOURS_FILTER.cmd:
+            hours = self._device_state(comfoair.RUNNING_HOURS_FILTER)
+            if hours is not None:
+                self.filter_predictor.add_hours(time.time(), hours)
+                self._filter_store.async_delay_save(
+                    self.filter_predictor.as_dict, FILTER_SAVE_DELAY
+                )
+                self._update_filter_due()
+
+        elif response_cmd == comfoair.ERRORS_FILTER.cmd:
+            self._update_filter_due()
+
+    def _device_state(self, attribute: comfoair.CAReponse) -> typing.Any:
+        """Return the value of the plain device reading a response attribute."""
+        return self._devices_by_response[response_key(attribute)][0].state
+
+    def _update_filter_due(self) -> None:
+        """Publish when the filter is due, see FilterPredictor."""
+        filter_full = bool(self._device_state(comfoair.ERRORS_FILTER))
+        due = None
+        if (timestamp := self.filter_predictor.predict(filter_full)) is not None:
+            # Whole hours, the prediction is not more accurate anyway.
+            due = dt_util.utc_from_timestamp(round(timestamp / 3600) * 3600)
+        self._update_state(self._filter_due_device, due, time.monotonic())
+
+    def _sample_recovered_power(self) -> None:
+        """Integrate the current recovered power into the energy counter."""
+        values = [
+            self._input_values.get(response_key(attribute))
+            for attribute in RECOVERED_POWER_INPUTS
+        ]
+        power = None if None in values else recovered_heat_power(self, *values)
+        now = time.monotonic()
+        grew = self.recovered_energy.add_sample(now, power)
+        self._update_state(
+            self._energy_device, round(self.recovered_energy.total, 3), now
+        )
+        if grew:
+            self._energy_store.async_delay_save(self._energy_data, ENERGY_SAVE_DELAY)
+
+    def _energy_data(self) -> dict[str, float]:
+        """Return the energy counter to store."""
+        return {"recovered_heat": self.recovered_energy.total}
+
+    def _set_group_stale(self, group: RequestGroup, stale: bool) -> None:
+        """Flag the devices of a request group for an availability update."""
+        if stale == (group.response_cmd in self._stale_responses):
+            return
+
+        if stale:
+            self.logger.warning("No response to %s, marking it stale", group.key)
+            self._stale_responses.add(group.response_cmd)
+        else:
+            self.logger.info("Request group %s is answering again", group.key)
+            self._stale_responses.discard(group.response_cmd)
+
+        self._changed.update(
+            device.key
+            for device in self.devices
+            if any(response.cmd == group.response_cmd for response in device.responses)
+        )
+
+    def _check_expired(self) -> None:
+        """Flag the devices whose value expired or became fresh again."""
+        now = time.monotonic()
+        expired = {
+            device.key
+            for device in self.devices
+            if any(
+                self._response_age(response, now) > self._max_age[response.cmd]
+                for response in device.responses
+            )
+        }
+        self._changed |= expired ^ self._expired
+        self._expired = expired
+
+    def _response_age(self, attribute: comfoair.CAReponse, now: float) -> float:
+        """Return the seconds since a response attribute was received."""
+        received = self._received.get(response_key(attribute))
+        if received is None:
+            return math.inf
+        return now - received
+
+    def device_available(self, device: Device) -> bool:
+        """Return if the value of the device is recent enough to be shown."""
+        return device.key not in self._expired and not any(
+            response.cmd in self._stale_responses for response in device.responses
+        )
+
+    async def _async_request(
+        self, group: RequestGroup, priority: Priority | None = None
+    ) -> None:
+        """Send a request through the bus and wait until its response is decoded.
+
+        The next command is sent as soon as the answer arrived, instead of
+        sleeping for a fixed amount of time between commands.
+        """
+        try:
+            await self.bus.async_send(
+                group.priority if priority is None else priority,
+                lambda: group.request(self.api),
+                group.last_response,
+            )
+        except TimeoutError as err:
+            raise UpdateFailed(f"Timeout waiting for {group.key} response") from err
+
+    async def _async_reconnect(self) -> None:
+        """Drop the connection to the unit and open a new one."""
+        if self.api.running:
+            await self.api.shutdown()
+        await self.api.connect()
+
+    async def async_shutdown(self) -> None:
+        """Stop the bus and close the connection to the unit."""
+        await super().async_shutdown()
+        if self._counters_loaded:
+            await self._energy_store.async_save(self._energy_data())
+            await self._filter_store.async_save(self.filter_predictor.as_dict())
+        await self.bus.async_stop()
+        if self.api.running:
+            await self.api.shutdown()
 
     def get_device_by_id(self, device_type: str, device_id: int) -> Device | None:
         """Return device by device id."""
         # Called by the binary sensors and sensors to get their updated data from self.data
-        try:
-            return [
-                device
-                for device in self.data.devices
-                if device.device_type == device_type and device.device_id == device_id
-            ][0]
-        except IndexError:
-            return None
+        return self.data.index.get((device_type, device_id))
 
     async def change_mode(self, mode: str) -> None:
         """Change mode."""
-        await self.api.set_speed(speed=comfoair.model.SetFanSpeed[mode])
+        speed = comfoair.model.SetFanSpeed[mode]
+        await self._async_write(
+            "fan_speed", lambda: self.api.set_speed(speed=speed), "ventilation_set"
+        )
 
     async def set_comfort_temperature(self, temperature: float) -> None:
         """Set comfort temperature."""
-        await self.api.set_comfort_temperature(int(temperature))
+        await self._async_write(
+            "comfort_temperature",
+            lambda: self.api.set_comfort_temperature(int(temperature)),
+            "temperatures",
+        )
+
+    async def _async_write(
+        self,
+        target: str,
+        send: typing.Callable[[], typing.Awaitable[None]],
+        readback: str,
+    ) -> None:
+        """Queue a write and wait until it has been sent and read back.
+
+        Writes are collected for WRITE_DEBOUNCE seconds, a burst of writes to
+        the same target only sends the last value. Raises HomeAssistantError
+        if the write of the target timed out.
+        """
+        self._pending_writes[target] = (send, readback)
+        if self._write_task is None:
+            self._write_task = self.config_entry.async_create_background_task(
+                self.hass, self._async_flush_writes(), f"{self.name} writes"
+            )
+        # Shielded, a caller giving up must not cancel the writes of others.
+        if target in await asyncio.shield(self._write_task):
+            raise HomeAssistantError(f"Timeout writing {target}")
+
+    async def _async_flush_writes(self) -> set[str]:
+        """Send the pending writes ahead of any queued poll, then read back.
+
+        A failed write does not hold back the others. All targets are read
+        back, so the entities show what the unit actually applied. Returns
+        the targets whose write failed.
+        """
+        await asyncio.sleep(WRITE_DEBOUNCE)
+
+        # Writes queued from here on start the next window.
+        self._write_task = None
+        writes, self._pending_writes = self._pending_writes, {}
+        failed = set()
+        for target, (send, _) in writes.items():
+            try:
+                await self.bus.async_send(Priority.WRITE, send)
+            except TimeoutError:
+                self.logger.warning("Timeout writing %s", target)
+                failed.add(target)
+
+        await self.async_refresh_groups(*{readback for _, readback in writes.values()})
+        return failed
@@ -0,0 +1,62 @@
+"""Diagnostics support for the Comfoair integration."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_HOST
+from homeassistant.core import HomeAssistant
+
+from . import MyConfigEntry
+
+TO_REDACT = {CONF_HOST}
+
+
+def _timestamp(value: float) -> str:
+    """Format a wall clock timestamp."""
+    return datetime.fromtimestamp(value, UTC).isoformat()
+
+
+def _json_value(value: Any) -> Any:
+    """Return a value the diagnostics can serialise."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return repr(value)
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: MyConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = config_entry.runtime_data.coordinator
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(config_entry.data), TO_REDACT),
+            "options": dict(config_entry.options),
+        },
+        "device": {
+            "name": coordinator.di_name,
+            "model": coordinator.di_model,
+            "sw_version": coordinator.di_sw_version,
+        },
+        "statistics": coordinator.statistics(),
+        "group_intervals": coordinator.group_intervals,
+        "states": {
+            device.name: _json_value(device.state) for device in coordinator.devices
+        },
+        "attributes": [
+            {
+                "time": _timestamp(received),
+                "attribute": label,
+                "value": _json_value(value),
+            }
+            for received, label, value in coordinator.attribute_log
+        ],
+        "frames": [
+            {"time": _timestamp(received), "cmd": f"{cmd:#04x}", "data": data.hex()}
+            for received, cmd, data in coordinator.frame_log
+        ],
+    }
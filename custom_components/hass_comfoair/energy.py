@@ -0,0 +1,40 @@
+"""Integration of power samples into an energy counter."""
+
+
+class EnergyIntegrator:
+    """Integrates power samples into an energy total with the trapezoidal rule.
+
+    Intervals longer than max_gap, e.g. while the unit was not answering, are
+    skipped rather than guessed. Negative power does not count, so the total
+    only ever increases.
+    """
+
+    __slots__ = ("_last", "max_gap", "total")
+
+    def __init__(self, max_gap: float, total: float = 0.0) -> None:
+        """Initialise integrator."""
+        self.max_gap = max_gap
+        # Energy in kWh.
+        self.total = total
+        # Monotonic time and power of the previous sample.
+        self._last: tuple[float, float] | None = None
+
+    def add_sample(self, now: float, power: float | None) -> bool:
+        """Add a power sample in W, return if the total grew.
+
+        A None sample ends the current interval, e.g. while an input is
+        unknown.
+        """
+        if power is None:
+            self._last = None
+            return False
+
+        power = max(power, 0.0)
+        last, self._last = self._last, (now, power)
+        if last is None or not 0 < now - last[0] <= self.max_gap:
+            return False
+
+        # Average power over the interval, W·s to kWh.
+        energy = (last[1] + power) / 2 * (now - last[0]) / 3_600_000
+        self.total += energy
+        return energy > 0
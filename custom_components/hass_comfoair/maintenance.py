@@ -0,0 +1,118 @@
+"""Prediction of the filter change from the filter running hours."""
+
+import typing
+
+from .buffer import SampleBuffer
+
+# One history sample per hour, a week of history.
+FILTER_SAMPLE_INTERVAL = 3600
+FILTER_HISTORY_SIZE = 168
+
+# Share of the sample interval after which a reading is kept. The running
+# hours are polled at about the sample interval and a poll may come a little
+# early, see SCHEDULE_SLACK.
+FILTER_SAMPLE_MARGIN = 0.9
+
+# History needed before the trend of the wear is trusted, in hours.
+MIN_TREND_SPAN = 6
+
+# Mean fan level in % at which the filter lasts its nominal life.
+REFERENCE_FAN_LEVEL = 50
+
+
+class FilterPredictor:
+    """Predicts when the filter is due.
+
+    The filter clogs faster at higher fan levels, so each increase of the
+    running hours counts as wear weighted by the mean fan level since the
+    previous reading, relative to REFERENCE_FAN_LEVEL. The wear is sampled
+    once an hour, its trend gives the wear per hour, which is below one
+    while the unit is switched off or runs at low levels. The filter is due
+    once the wear reaches its life.
+    """
+
+    __slots__ = (
+        "_history",
+        "_level_count",
+        "_level_sum",
+        "_reading",
+        "_sample_interval",
+        "life",
+        "wear",
+    )
+
+    def __init__(self, life: float, poll_interval: float) -> None:
+        """Initialise predictor."""
+        # Filter wear in running hours at REFERENCE_FAN_LEVEL at which the
+        # filter is due.
+        self.life = life
+        self.wear = 0.0
+        self._history = SampleBuffer(FILTER_HISTORY_SIZE)
+        # Running hours polled less often than hourly are kept on every poll.
+        self._sample_interval = FILTER_SAMPLE_MARGIN * max(
+            FILTER_SAMPLE_INTERVAL, poll_interval
+        )
+        # Last reading of the running hours and the fan levels since then.
+        self._reading: tuple[float, float] | None = None
+        self._level_sum = 0.0
+        self._level_count = 0
+
+    def as_dict(self) -> dict[str, typing.Any]:
+        """Return the wear and its history to store across restarts."""
+        return {
+            "wear": self.wear,
+            "reading": self._reading,
+            "history": list(self._history),
+        }
+
+    def restore(self, data: dict[str, typing.Any]) -> None:
+        """Continue from a state returned by as_dict."""
+        self.wear = data["wear"]
+        self._reading = tuple(data["reading"]) if data["reading"] else None
+        self._history.clear()
+        for timestamp, wear in data["history"]:
+            self._history.append(timestamp, wear)
+
+    def add_level(self, level: float) -> None:
+        """Add a fan level sample in %."""
+        self._level_sum += level
+        self._level_count += 1
+
+    def add_hours(self, timestamp: float, hours: float) -> None:
+        """Add a reading of the filter running hours."""
+        if self._reading is None or hours < self._reading[1]:
+            # The levels before the first reading or a reset of the counter,
+            # when the filter has been replaced, are unknown.
+            self._history.clear()
+            self.wear = hours
+        else:
+            factor = 1.0
+            if self._level_count:
+                factor = self._level_sum / self._level_count / REFERENCE_FAN_LEVEL
+            self.wear += (hours - self._reading[1]) * factor
+
+        self._reading = (timestamp, hours)
+        self._level_sum = 0.0
+        self._level_count = 0
+
+        last = self._history.last()
+        if last is None or timestamp - last[0] >= self._sample_interval:
+            self._history.append(timestamp, self.wear)
+
+    def predict(self, filter_full: bool = False) -> float | None:
+        """Return the timestamp the filter is due, None if unknown."""
+        if self._reading is None:
+            return None
+        timestamp = self._reading[0]
+        if filter_full or self.wear >= self.life:
+            return timestamp
+
+        # Assume the unit runs all the time until the trend is known.
+        rate = 1.0
+        first_timestamp, first_wear = self._history.first()
+        if (span := (timestamp - first_timestamp) / 3600) >= MIN_TREND_SPAN:
+            rate = (self.wear - first_wear) / span
+
+        if rate <= 0:
+            return None
+        return timestamp + (self.life - self.wear) / rate * 3600
@@ -41,7 +41,7 @@ class CANumber(CoordinatorEntity, NumberEntity):
 
     def __init__(self, coordinator: CACoordinator, device: Device) -> None:
         """Initialise sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device.key)
         self.device = device
         self.device_id = device.device_id
 
@@ -55,6 +55,13 @@ class CANumber(CoordinatorEntity, NumberEntity):
         _LOGGER.debug("Device: %s", self.device)
         self.async_write_ha_state()
 
+    @property
+    def available(self) -> bool:
+        """Return if the device is available."""
+        # Unavailable while its request group is not answering or its value
+        # expired.
+        return super().available and self.coordinator.device_available(self.device)
+
     @property
     def device_info(self) -> DeviceInfo:
         """Return device information."""
@@ -43,7 +43,7 @@ class CASelect(CoordinatorEntity, SelectEntity):
 
     def __init__(self, coordinator: CACoordinator, device: Device) -> None:
         """Initialise sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device.key)
         self.device = device
         self.device_id = device.device_id
 
@@ -57,6 +57,12 @@ class CASelect(CoordinatorEntity, SelectEntity):
         _LOGGER.debug("Device: %s", self.device)
         self.async_write_ha_state()
 
+    @property
+    def available(self) -> bool:
+        """Return if the device is available."""
+        # Unavailable while the fan speed is not answered or is too old.
+        return super().available and self.coordinator.device_available(self.device)
+
     @property
     def device_info(self) -> DeviceInfo:
         """Return device information."""
@@ -76,8 +82,10 @@ class CASelect(CoordinatorEntity, SelectEntity):
         return ["auto", "away", "low", "middle", "high"]
 
     @property
-    def current_option(self) -> str:
+    def current_option(self) -> str | None:
         """Return the state of the entity."""
+        if self.device.state is None:
+            return None
         return comfoair.model.SetFanSpeed(self.device.state).name
 
     @property
@@ -91,12 +99,11 @@ class CASelect(CoordinatorEntity, SelectEntity):
         """Select option."""
         await self.coordinator.change_mode(option)
 
-        # trigger data refresh
-        await self.coordinator.async_request_refresh()
-
     @property
     def icon(self) -> str:
         """Return the icon."""
+        if self.device.state is None:
+            return "mdi:fan-alert"
         speed = comfoair.model.SetFanSpeed(self.device.state)
 
         match speed:
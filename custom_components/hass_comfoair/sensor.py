@@ -1,24 +1,107 @@
 """Interfaces with the Integration 101 Template api sensors."""
 
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime
 import logging
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import UnitOfTemperature
+from homeassistant.const import EntityCategory, UnitOfTemperature, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import MyConfigEntry
-from .coordinator import CACoordinator, Device
+from .coordinator import DIAGNOSTICS_KEY, CACoordinator, Device
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(frozen=True, kw_only=True)
+class CADiagnosticSensorDescription(SensorEntityDescription):
+    """Description of a sensor showing a bus statistic."""
+
+    value_fn: Callable[[CACoordinator], float | int | None]
+
+
+def _milliseconds(seconds: float | None) -> float | None:
+    """Convert seconds to rounded milliseconds."""
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+# Statistics to size the poll intervals and to spot a bad gateway.
+# The latencies are across all commands on the bus, the diagnostics also
+# break them down per request group.
+DIAGNOSTIC_SENSORS: tuple[CADiagnosticSensorDescription, ...] = (
+    CADiagnosticSensorDescription(
+        key="bus_latency_p50",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: _milliseconds(coordinator.bus.latency(0.5)),
+    ),
+    CADiagnosticSensorDescription(
+        key="bus_latency_p95",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: _milliseconds(coordinator.bus.latency(0.95)),
+    ),
+    CADiagnosticSensorDescription(
+        key="bus_latency_max",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: _milliseconds(coordinator.bus.latency(1.0)),
+    ),
+    CADiagnosticSensorDescription(
+        key="poll_cycle_duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: _milliseconds(coordinator.cycle_duration),
+    ),
+    CADiagnosticSensorDescription(
+        key="frames_per_second",
+        native_unit_of_measurement="frames/s",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: (
+            None
+            if coordinator.frames_per_second is None
+            else round(coordinator.frames_per_second, 2)
+        ),
+    ),
+    CADiagnosticSensorDescription(
+        key="bus_timeouts",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.bus.timeouts,
+    ),
+    CADiagnosticSensorDescription(
+        key="checksum_errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.api.checksum_errors,
+    ),
+    CADiagnosticSensorDescription(
+        key="reconnects",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: coordinator.bus.reconnects,
+    ),
+    CADiagnosticSensorDescription(
+        key="attribute_event_time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: _milliseconds(coordinator.attr_event_time),
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: MyConfigEntry,
@@ -37,6 +120,11 @@ async def async_setup_entry(
         if device.device_type == "sensor"
     ]
 
+    sensors.extend(
+        CADiagnosticSensor(coordinator, description)
+        for description in DIAGNOSTIC_SENSORS
+    )
+
     # Create the sensors.
     async_add_entities(sensors)
 
@@ -46,7 +134,7 @@ class CASensor(CoordinatorEntity, SensorEntity):
 
     def __init__(self, coordinator: CACoordinator, device: Device) -> None:
         """Initialise sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=device.key)
         self.device = device
         self.device_id = device.device_id
 
@@ -60,6 +148,13 @@ class CASensor(CoordinatorEntity, SensorEntity):
         _LOGGER.debug("Device: %s", self.device)
         self.async_write_ha_state()
 
+    @property
+    def available(self) -> bool:
+        """Return if the device is available."""
+        # Unavailable while its request group is not answering or its value
+        # is older than the max age, see CACoordinator.device_available.
+        return super().available and self.coordinator.device_available(self.device)
+
     @property
     def device_class(self) -> str:
         """Return device class."""
@@ -80,10 +175,12 @@ class CASensor(CoordinatorEntity, SensorEntity):
         return self.device.name
 
     @property
-    def native_value(self) -> int | float:
+    def native_value(self) -> int | float | datetime | None:
         """Return the state of the entity."""
         # Using native value and native unit of measurement, allows you to change units
         # in Lovelace and HA will automatically calculate the correct value.
+        if self.device.device_class == SensorDeviceClass.TIMESTAMP:
+            return self.device.state
         try:
             return float(self.device.state)
         except TypeError:
@@ -101,7 +198,7 @@ class CASensor(CoordinatorEntity, SensorEntity):
     def state_class(self) -> str | None:
         """Return state class."""
         # https://developers.home-assistant.io/docs/core/entity/sensor/#available-state-classes
-        return SensorStateClass.MEASUREMENT
+        return self.device.state_class
 
     @property
     def unique_id(self) -> str:
@@ -114,3 +211,36 @@ class CASensor(CoordinatorEntity, SensorEntity):
     def icon(self) -> str:
         """Return the icon."""
         return self.device.icon
+
+
+class CADiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """Sensor showing a statistic of the bus to the unit."""
+
+    entity_description: CADiagnosticSensorDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self, coordinator: CACoordinator, description: CADiagnosticSensorDescription
+    ) -> None:
+        """Initialise sensor."""
+        # Updated once per poll cycle.
+        super().__init__(coordinator, context=DIAGNOSTICS_KEY)
+        self.entity_description = description
+        self._attr_name = description.key
+        self._attr_unique_id = description.key
+
+    @property
+    def available(self) -> bool:
+        """Return if the entity is available."""
+        # Most useful while the unit is not answering.
+        return True
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device information."""
+        return self.coordinator.device_info()
+
+    @property
+    def native_value(self) -> float | int | None:
+        """Return the state of the entity."""
+        return self.entity_description.value_fn(self.coordinator)
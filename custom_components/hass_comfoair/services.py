@@ -0,0 +1,84 @@
+"""Services of the Comfoair integration."""
+
+from __future__ import annotations
+
+import time
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .coordinator import HISTORY_DEVICES, CACoordinator
+
+SERVICE_GET_HISTORY = "get_history"
+
+ATTR_SENSORS = "sensors"
+ATTR_DURATION = "duration"
+ATTR_WINDOW = "window"
+
+# Upper bound of the windows returned per sensor.
+MAX_WINDOWS = 1000
+
+GET_HISTORY_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_SENSORS): vol.All(cv.ensure_list, [vol.In(HISTORY_DEVICES)]),
+        vol.Optional(ATTR_DURATION, default=3600): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+        vol.Optional(ATTR_WINDOW, default=300): vol.All(
+            vol.Coerce(int), vol.Range(min=1)
+        ),
+    }
+)
+
+
+def _get_coordinator(hass: HomeAssistant) -> CACoordinator:
+    """Return the coordinator of the loaded config entry."""
+    # At most one entry, see single_config_entry in the manifest.
+    if not (entries := hass.config_entries.async_loaded_entries(DOMAIN)):
+        raise ServiceValidationError("Comfoair is not loaded")
+    return entries[0].runtime_data.coordinator
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+
+    async def async_get_history(call: ServiceCall) -> ServiceResponse:
+        """Return min, max and mean per window of recent sensor values."""
+        coordinator = _get_coordinator(hass)
+        duration = call.data[ATTR_DURATION]
+        window = max(call.data[ATTR_WINDOW], duration / MAX_WINDOWS)
+        start = time.time() - duration
+
+        return {
+            name: [
+                {
+                    "start": dt_util.utc_from_timestamp(window_start).isoformat(),
+                    "min": low,
+                    "max": high,
+                    "mean": round(mean, 2),
+                    "count": count,
+                }
+                for window_start, low, high, mean, count in coordinator.history(
+                    name, start, window
+                )
+            ]
+            for name in call.data[ATTR_SENSORS]
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_HISTORY,
+        async_get_history,
+        schema=GET_HISTORY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
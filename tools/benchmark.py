@@ -0,0 +1,213 @@
+"""Benchmark the integration against the ComfoAir emulator.
+
+Sets up the config entry with all platforms in a test Home Assistant
+instance, lets the coordinator poll the emulator for a while and writes
+the measurements to a JSON file:
+
+    python tools/benchmark.py --duration 60 --interval 5 --output bench.json
+
+Requires homeassistant and pytest-homeassistant-custom-component, which
+provides the test instance.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "tools"))
+
+from comfoair_emulator import ComfoAirEmulator, EmulatorConfig
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_test_home_assistant,
+)
+
+from custom_components.hass_comfoair.const import (
+    CONF_GUARD_TIME,
+    DOMAIN,
+    conf_group_interval,
+)
+from custom_components.hass_comfoair.coordinator import REQUEST_GROUPS, CACoordinator
+from homeassistant import loader
+from homeassistant.const import CONF_HOST, CONF_PORT
+from homeassistant.helpers.entity import Entity
+
+
+@dataclass
+class Counters:
+    """Measurements collected by the instrumented hot paths."""
+
+    cycles: list[float] = field(default_factory=list)
+    state_writes: int = 0
+    attr_events: int = 0
+    attr_event_seconds: float = 0.0
+
+    def reset(self) -> None:
+        """Forget everything measured during setup."""
+        self.cycles.clear()
+        self.state_writes = 0
+        self.attr_events = 0
+        self.attr_event_seconds = 0.0
+
+
+def instrument(counters: Counters) -> None:
+    """Wrap the coordinator and entity hot paths with counters."""
+    update_data = CACoordinator.async_update_data
+    attr_event = CACoordinator.ca_attr_event
+    write_state = Entity.async_write_ha_state
+
+    async def timed_update_data(self):
+        start = time.perf_counter()
+        try:
+            return await update_data(self)
+        finally:
+            counters.cycles.append(time.perf_counter() - start)
+
+    async def timed_attr_event(self, attribute, value):
+        start = time.perf_counter()
+        try:
+            await attr_event(self, attribute, value)
+        finally:
+            counters.attr_events += 1
+            counters.attr_event_seconds += time.perf_counter() - start
+
+    def counted_write_state(self):
+        counters.state_writes += 1
+        write_state(self)
+
+    CACoordinator.async_update_data = timed_update_data
+    CACoordinator.ca_attr_event = timed_attr_event
+    Entity.async_write_ha_state = counted_write_state
+
+
+def _summary(values: list[float]) -> dict[str, float]:
+    """Return min, mean, p95 and max of a list of durations."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+    return {
+        "min": ordered[0],
+        "mean": statistics.fmean(ordered),
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Run one benchmark and return the results."""
+    counters = Counters()
+    instrument(counters)
+
+    emulator = ComfoAirEmulator(
+        EmulatorConfig(
+            latency=args.latency,
+            jitter=args.jitter,
+            drop_rate=args.drop,
+            corrupt_rate=args.corrupt,
+            seed=args.seed,
+        )
+    )
+    port = await emulator.start()
+
+    tracemalloc.start()
+    with tempfile.TemporaryDirectory() as config_dir:
+        async with async_test_home_assistant(config_dir=config_dir) as hass:
+            hass.data.pop(loader.DATA_CUSTOM_COMPONENTS, None)
+
+            options = {CONF_GUARD_TIME: args.guard_time}
+            if args.interval:
+                options |= {
+                    conf_group_interval(group.key): args.interval
+                    for group in REQUEST_GROUPS
+                }
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                data={CONF_HOST: "127.0.0.1", CONF_PORT: port},
+                options=options,
+                unique_id="benchmark",
+            )
+            entry.add_to_hass(hass)
+
+            start = time.perf_counter()
+            if not await hass.config_entries.async_setup(entry.entry_id):
+                raise RuntimeError("Setting up the config entry failed")
+            await hass.async_block_till_done()
+            setup_seconds = time.perf_counter() - start
+            entities = len(hass.states.async_all())
+
+            counters.reset()
+            responses = emulator.responses
+            tracemalloc.reset_peak()
+            start = time.perf_counter()
+            await asyncio.sleep(args.duration)
+            elapsed = time.perf_counter() - start
+            _, peak_memory = tracemalloc.get_traced_memory()
+
+            coordinator = entry.runtime_data.coordinator
+            await hass.config_entries.async_unload(entry.entry_id)
+            await coordinator.api.shutdown()
+    tracemalloc.stop()
+    await emulator.close()
+
+    cycles = len(counters.cycles)
+    return {
+        "config": vars(args),
+        "setup_seconds": setup_seconds,
+        "entities": entities,
+        "duration_seconds": elapsed,
+        "cycles": cycles,
+        "cycle_seconds": _summary(counters.cycles),
+        "frames_per_second": (emulator.responses - responses) / elapsed,
+        "state_writes": counters.state_writes,
+        "state_writes_per_cycle": counters.state_writes / cycles if cycles else None,
+        "attr_events": counters.attr_events,
+        "attr_event_seconds": counters.attr_event_seconds,
+        "attr_event_mean_us": (
+            counters.attr_event_seconds / counters.attr_events * 1e6
+            if counters.attr_events
+            else None
+        ),
+        "peak_memory_kib": peak_memory / 1024,
+        "emulator": {
+            "requests": emulator.requests,
+            "responses": emulator.responses,
+            "dropped": emulator.dropped,
+            "corrupted": emulator.corrupted,
+        },
+    }
+
+
+def main() -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--duration", type=float, default=60, help="seconds to poll")
+    parser.add_argument(
+        "--interval", type=int, default=None, help="poll interval of every group"
+    )
+    parser.add_argument("--guard-time", type=float, default=0.0)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--drop", type=float, default=0.0)
+    parser.add_argument("--corrupt", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("bench_output.json"))
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    args.output.write_text(json.dumps(results, indent=2, default=str) + "\n")
+    print(json.dumps(results, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,364 @@
+"""Emulate a ComfoAir unit behind an RS232-over-TCP gateway.
+
+Answers the commands used by the integration with frames in the ComfoAir
+serial protocol, so the coordinator can run end to end without hardware:
+
+    python tools/comfoair_emulator.py --port 2001 --latency 0.05 --drop 0.02
+
+Then add the integration with the host and port of the emulator. Latency,
+jitter, dropped and corrupted frames can be configured to reproduce a slow
+or noisy gateway.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import dataclass, field
+import logging
+import math
+import random
+import struct
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+ESC = 0x07
+START = b"\x07\xf0"
+END = b"\x07\x0f"
+ACK = b"\x07\xf3"
+
+FIRMWARE_VERSION = bytes((3, 60, 0))
+FIRMWARE_NAME = b"CA350 luxe"
+BOOTLOADER_VERSION = bytes((3, 0, 0))
+BOOTLOADER_NAME = b"ComfoAir  "
+CONNECTOR_BOARD_VERSION = bytes((3, 11))
+CONNECTOR_BOARD_NAME = b"ComfoSense"
+
+# Ventilation level in percent per fan speed (away, low, middle, high).
+LEVELS_EXHAUST = (15, 35, 50, 70)
+LEVELS_SUPPLY = (15, 35, 50, 70)
+
+
+def checksum(payload: bytes) -> int:
+    """Return the checksum of command, length and unescaped data."""
+    return (sum(payload) + 173) & 0xFF
+
+
+def escape(data: bytes) -> bytes:
+    """Double every escape byte in the data."""
+    return data.replace(b"\x07", b"\x07\x07")
+
+
+def create_frame(cmd: int, data: bytes = b"") -> bytes:
+    """Return a complete frame for a command and its data.
+
+    Like the unit, only data and checksum are escaped, not the header.
+    """
+    header = struct.pack(">HB", cmd, len(data))
+    checksum_byte = bytes((checksum(header + data),))
+    return START + header + escape(data) + escape(checksum_byte) + END
+
+
+def _unescape_bytes(buf: bytes, pos: int, count: int) -> tuple[bytes, int] | None:
+    """Read count unescaped bytes from pos, None if the buffer is too short."""
+    out = bytearray()
+    while len(out) < count:
+        if pos >= len(buf):
+            return None
+        if buf[pos] == ESC:
+            if pos + 1 >= len(buf):
+                return None
+            if buf[pos + 1] != ESC:
+                # Unescaped escape byte inside a frame, resynchronise.
+                return b"", -1
+            pos += 1
+        out.append(buf[pos])
+        pos += 1
+    return bytes(out), pos
+
+
+def parse_frames(buf: bytes) -> tuple[list[tuple[int, bytes]], bytes]:
+    """Split a receive buffer into complete frames and the unparsed rest.
+
+    ACKs, garbage and frames with a bad checksum are dropped.
+    """
+    frames: list[tuple[int, bytes]] = []
+
+    while (start := buf.find(START)) >= 0:
+        buf = buf[start:]
+        header_end = len(START) + 3
+        if len(buf) < header_end:
+            break
+        header = buf[len(START) : header_end]
+        cmd, length = struct.unpack(">HB", header)
+
+        if (body := _unescape_bytes(buf, header_end, length + 1)) is None:
+            # Frame not complete yet, wait for more data.
+            break
+        raw, pos = body
+        if pos < 0 or buf[pos : pos + len(END)] != END:
+            if pos >= 0 and len(buf) < pos + len(END):
+                break
+            _LOGGER.debug("Dropping malformed frame %s", buf[:header_end].hex())
+            buf = buf[len(START) :]
+            continue
+
+        buf = buf[pos + len(END) :]
+        data = raw[:-1]
+        if checksum(header + data) != raw[-1]:
+            _LOGGER.debug("Dropping frame %#x with bad checksum", cmd)
+            continue
+        frames.append((cmd, data))
+
+    return frames, buf
+
+
+def encode_temperature(value: float) -> int:
+    """Encode a temperature in the protocol's half degree steps."""
+    return max(0, min(255, round((value + 20) * 2)))
+
+
+def encode_rpm(rpm: float) -> bytes:
+    """Encode a fan speed as the raw period value sent by the unit."""
+    return struct.pack(">H", min(0xFFFF, round(1875000 / max(rpm, 1))))
+
+
+@dataclass
+class EmulatorConfig:
+    """Timing and fault behaviour of the emulated gateway."""
+
+    latency: float = 0.0
+    jitter: float = 0.0
+    drop_rate: float = 0.0
+    corrupt_rate: float = 0.0
+    seed: int | None = None
+
+
+@dataclass
+class UnitState:
+    """Simulated state of the ventilation unit."""
+
+    fan_speed: int = 2
+    comfort_temperature: float = 21.0
+    filter_hours: int = 1200
+    filter_full: bool = False
+    started: float = field(default_factory=time.monotonic)
+
+    def temperatures(self, rng: random.Random) -> tuple[float, float, float, float]:
+        """Return outside, supply, return and exhaust temperatures."""
+        elapsed = time.monotonic() - self.started
+        outside = 5 + 3 * math.sin(elapsed / 3600) + rng.uniform(-0.5, 0.5)
+        inside = self.comfort_temperature + rng.uniform(-0.5, 0.5)
+        # About 85 % of the heat is recovered by the exchanger.
+        supply = outside + 0.85 * (inside - outside)
+        exhaust = inside - 0.85 * (inside - outside)
+        return outside, supply, inside, exhaust
+
+    def levels(self) -> tuple[int, int]:
+        """Return the current exhaust and supply level in percent."""
+        level = max(self.fan_speed, 1) - 1
+        return LEVELS_EXHAUST[level], LEVELS_SUPPLY[level]
+
+    def running_hours(self) -> int:
+        """Return the filter hours including the time since start."""
+        return self.filter_hours + int((time.monotonic() - self.started) / 3600)
+
+
+class ComfoAirEmulator:
+    """Asyncio TCP server answering like a ComfoAir unit."""
+
+    def __init__(self, config: EmulatorConfig | None = None) -> None:
+        """Initialise emulator."""
+        self.config = config or EmulatorConfig()
+        self.state = UnitState()
+        self.requests = 0
+        self.responses = 0
+        self.dropped = 0
+        self.corrupted = 0
+        self._rng = random.Random(self.config.seed)
+        self._server: asyncio.Server | None = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start listening and return the bound port."""
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self) -> None:
+        """Stop listening and close all connections."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def serve_forever(self) -> None:
+        """Serve until cancelled."""
+        if self._server is None:
+            raise RuntimeError("Emulator not started")
+        await self._server.serve_forever()
+
+    async def _handle_client(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Answer the frames of one gateway client."""
+        peer = writer.get_extra_info("peername")
+        _LOGGER.info("Client %s connected", peer)
+        buf = b""
+
+        try:
+            while data := await reader.read(256):
+                frames, buf = parse_frames(buf + data)
+                for cmd, payload in frames:
+                    await self._answer(writer, cmd, payload)
+        except ConnectionError:
+            pass
+        finally:
+            _LOGGER.info("Client %s disconnected", peer)
+            writer.close()
+
+    async def _answer(
+        self, writer: asyncio.StreamWriter, cmd: int, payload: bytes
+    ) -> None:
+        """Acknowledge a command and send its response."""
+        self.requests += 1
+
+        if self._rng.random() < self.config.drop_rate:
+            self.dropped += 1
+            _LOGGER.debug("Dropping command %#x", cmd)
+            return
+
+        delay = self.config.latency + self._rng.uniform(0, self.config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        writer.write(ACK)
+        response = self._response(cmd, payload)
+        if response is not None:
+            frame = create_frame(*response)
+            if self._rng.random() < self.config.corrupt_rate:
+                self.corrupted += 1
+                # Flip the checksum, the client has to discard the frame.
+                frame = frame[:-3] + bytes((frame[-3] ^ 0x5A,)) + frame[-2:]
+            writer.write(frame)
+            self.responses += 1
+        await writer.drain()
+
+    def _response(self, cmd: int, payload: bytes) -> tuple[int, bytes] | None:
+        """Return the response to a command, None if only acknowledged."""
+        state = self.state
+        rng = self._rng
+
+        match cmd:
+            case 0x67:
+                return 0x68, BOOTLOADER_VERSION + BOOTLOADER_NAME
+            case 0x69:
+                return 0x6A, FIRMWARE_VERSION + FIRMWARE_NAME
+            case 0xA1:
+                return (
+                    0xA2,
+                    CONNECTOR_BOARD_VERSION + CONNECTOR_BOARD_NAME + b"\x00\x00",
+                )
+            case 0x0B:
+                exhaust, supply = state.levels()
+                return 0x0C, (
+                    bytes((supply, exhaust))
+                    + encode_rpm(supply * 28 + rng.uniform(-15, 15))
+                    + encode_rpm(exhaust * 27 + rng.uniform(-15, 15))
+                )
+            case 0x0D:
+                outside, _, inside, _ = state.temperatures(rng)
+                bypass = (
+                    100
+                    if outside < inside and inside > state.comfort_temperature + 0.4
+                    else 0
+                )
+                return 0x0E, bytes((bypass, 0, 0, 0, 0, 0, 0))
+            case 0x0F:
+                return 0x10, bytes(
+                    encode_temperature(value) for value in state.temperatures(rng)
+                )
+            case 0xCD:
+                exhaust, supply = state.levels()
+                return 0xCE, (
+                    bytes(LEVELS_EXHAUST[:3])
+                    + bytes(LEVELS_SUPPLY[:3])
+                    + bytes((exhaust, supply, state.fan_speed, 1))
+                    + bytes((LEVELS_EXHAUST[3], LEVELS_SUPPLY[3], 0, 0))
+                )
+            case 0xD1:
+                return 0xD2, (
+                    bytes((encode_temperature(state.comfort_temperature),))
+                    + bytes(
+                        encode_temperature(value) for value in state.temperatures(rng)
+                    )
+                    + bytes((0x0F, 0, 0, 0))
+                )
+            case 0xD9:
+                data = bytearray(17)
+                data[8] = int(state.filter_full)
+                return 0xDA, bytes(data)
+            case 0xDD:
+                data = bytearray(20)
+                data[15:17] = struct.pack(">H", state.running_hours())
+                return 0xDE, bytes(data)
+            case 0x99 if payload:
+                state.fan_speed = payload[0]
+                _LOGGER.info("Fan speed set to %d", state.fan_speed)
+            case 0xD3 if payload:
+                state.comfort_temperature = payload[0] / 2 - 20
+                _LOGGER.info(
+                    "Comfort temperature set to %.1f", state.comfort_temperature
+                )
+            case _:
+                _LOGGER.debug("Acknowledging unknown command %#x", cmd)
+
+        return None
+
+
+async def _main(args: argparse.Namespace) -> None:
+    emulator = ComfoAirEmulator(
+        EmulatorConfig(
+            latency=args.latency,
+            jitter=args.jitter,
+            drop_rate=args.drop,
+            corrupt_rate=args.corrupt,
+            seed=args.seed,
+        )
+    )
+    port = await emulator.start(args.host, args.port)
+    _LOGGER.info("Emulating a ComfoAir unit on %s:%d", args.host, port)
+    try:
+        await emulator.serve_forever()
+    finally:
+        await emulator.close()
+
+
+def main() -> None:
+    """Run the emulator from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=2001)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds per reply")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random delay")
+    parser.add_argument(
+        "--drop", type=float, default=0.0, help="share of commands ignored"
+    )
+    parser.add_argument(
+        "--corrupt",
+        type=float,
+        default=0.0,
+        help="share of replies with a bad checksum",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("-v", "--verbose", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO)
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()